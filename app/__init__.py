@@ -4,12 +4,14 @@ from flask_login import LoginManager
 from config import config
 
 
-def create_app(config_name=None):
+def create_app(config_name=None, test_config=None):
     """
     Flask application factory.
 
     Args:
         config_name: Configuration name ('development', 'production', or None for default)
+        test_config: Optional dict of settings applied on top of the configuration
+            (used by the test suite, e.g. to point DATABASE_PATH at a temp file)
 
     Returns:
         Flask application instance
@@ -21,6 +23,8 @@ def create_app(config_name=None):
 
     # Load configuration
     app.config.from_object(config.get(config_name, config['default']))
+    if test_config is not None:
+        app.config.update(test_config)
 
     # Initialize Flask-Login
     login_manager = LoginManager()
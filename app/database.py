@@ -2,9 +2,9 @@ import sqlite3
 import os
 from datetime import datetime
 import json
-import shutil
 from flask import g, current_app
 from app.utils.database_helpers import db_row_to_dict, dict_to_db_values
+from sqlite_settings import configure_connection
 
 
 def get_db():
@@ -13,6 +13,7 @@ def get_db():
         db_path = current_app.config['DATABASE_PATH']
         g.db = sqlite3.connect(db_path)
         g.db.row_factory = sqlite3.Row  # Return rows as dictionaries
+        configure_connection(g.db)
     return g.db
 
 
@@ -37,7 +38,18 @@ def backup_database(db_path=None):
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.backup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
+
+    # SQLite's online backup API rather than a file copy: it includes pages
+    # still in the -wal file and is consistent while the app is running
+    src = sqlite3.connect(db_path)
+    try:
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst, pages=1024)
+        finally:
+            dst.close()
+    finally:
+        src.close()
     return backup_path
 
 
@@ -51,7 +63,63 @@ def init_db():
 
     db = get_db()
 
-    # Create activities table with full Strava data model
+    # WAL is stored in the database file, so one switch here covers every
+    # later connection (Flask requests, the MCP server and the scripts) as
+    # well as the migrations below; get_db() only adds synchronous=NORMAL
+    db.execute('PRAGMA journal_mode = WAL')
+
+    # Already set up by this version of the code: skip the migration checks
+    if db.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+        return
+
+    # Apply the schema and all migrations as one transaction: a single commit
+    # instead of one per step, and nothing is left half-applied if a step fails.
+    # IMMEDIATE takes the write lock up front, so workers starting together
+    # queue on busy_timeout instead of failing to upgrade a read transaction.
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        # Another process may have migrated while we waited for the lock
+        if db.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            db.commit()
+            return
+        _create_schema(db)
+        db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+
+    # Table rebuilds leave the old pages on the freelist. Compact the file
+    # when the migrations freed a sizeable share of it (VACUUM cannot run
+    # inside the transaction above).
+    free_pages = db.execute('PRAGMA freelist_count').fetchone()[0]
+    if free_pages > db.execute('PRAGMA page_count').fetchone()[0] // 4:
+        try:
+            db.execute('VACUUM')
+        except sqlite3.OperationalError:
+            # Another connection is busy; the space is reused by later writes
+            pass
+
+
+_ACTIVITY_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_start_date ON activities(start_date)',
+    'CREATE INDEX IF NOT EXISTS idx_sport_type ON activities(sport_type)',
+    'CREATE INDEX IF NOT EXISTS idx_type ON activities(type)',
+    'CREATE INDEX IF NOT EXISTS idx_day_date ON activities(day_date)',
+    # gear_id for efficient joins
+    'CREATE INDEX IF NOT EXISTS idx_gear_id ON activities(gear_id)',
+)
+
+
+def _create_schema(db):
+    """Create tables and run idempotent migrations (caller manages the transaction)"""
+    schema = _SchemaInfo(db)
+    for step in _MIGRATIONS:
+        step(db, schema)
+
+
+def _create_activities_table(db, schema):
+    """Create activities table with full Strava data model"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS activities (
             id INTEGER PRIMARY KEY,
@@ -155,10 +223,9 @@ def init_db():
         )
     ''')
 
-    # Run migrations to add new columns to existing databases
-    _migrate_add_feeling_columns(db)
 
-    # Create days table for daily overall feelings
+def _create_days_table(db, schema):
+    """Create days table for daily overall feelings"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS days (
             date TEXT PRIMARY KEY,
@@ -170,40 +237,9 @@ def init_db():
         )
     ''')
 
-    # Run migration to add coach_comment columns
-    _migrate_add_coach_comment_columns(db)
-
-    # Run migration to add extended activity types and planned activities
-    _migrate_add_extended_activity_types(db)
-
-    # Run migration to add standard activity types with FK constraints
-    _migrate_add_standard_activity_types(db)
-
-    # Run migration to remove planned_activities table
-    _migrate_remove_planned_activities(db)
-
-    # Run migration to add planning feature
-    _migrate_add_planning_feature(db)
-
-    # Run migration to clean up root='...' sport type entries
-    _migrate_cleanup_root_sport_types(db)
-
-    # Run migration to add archive-specific columns
-    _migrate_add_archive_columns(db)
-
-    # Run migration to add invitations table
-    _migrate_add_invitations_table(db)
-
-    # Run migration to add API keys table
-    _migrate_add_api_keys_table(db)
 
-    # Run migration to add training templates
-    _migrate_add_training_templates(db)
-
-    # Run migration to add template_id to planned_activities
-    _migrate_add_template_to_planned(db)
-
-    # Create activity_media table for photos linked to activities
+def _create_activity_media_table(db, schema):
+    """Create activity_media table for photos linked to activities"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS activity_media (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -216,13 +252,9 @@ def init_db():
     ''')
     db.execute('CREATE INDEX IF NOT EXISTS idx_activity_media_activity ON activity_media(activity_id)')
 
-    # Create indexes for common queries
-    db.execute('CREATE INDEX IF NOT EXISTS idx_start_date ON activities(start_date)')
-    db.execute('CREATE INDEX IF NOT EXISTS idx_sport_type ON activities(sport_type)')
-    db.execute('CREATE INDEX IF NOT EXISTS idx_type ON activities(type)')
-    db.execute('CREATE INDEX IF NOT EXISTS idx_day_date ON activities(day_date)')
 
-    # Create strava_tokens table for persistent OAuth tokens
+def _create_strava_tokens_table(db, schema):
+    """Create strava_tokens table for persistent OAuth tokens"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS strava_tokens (
             id INTEGER PRIMARY KEY DEFAULT 1,
@@ -237,7 +269,9 @@ def init_db():
         )
     ''')
 
-    # Create gear table for equipment (bikes, shoes, etc.)
+
+def _create_gear_table(db, schema):
+    """Create gear table for equipment (bikes, shoes, etc.)"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS gear (
             id TEXT PRIMARY KEY,
@@ -256,17 +290,63 @@ def init_db():
         )
     ''')
 
-    # Create index on gear_id for efficient joins
-    db.execute('CREATE INDEX IF NOT EXISTS idx_gear_id ON activities(gear_id)')
 
-    db.commit()
+def _create_activity_indexes(db, schema):
+    """Create indexes for common queries on activities"""
+    # Built back to back after all column additions and backfills, so on a
+    # fresh build the later scans find the table pages already in the page cache.
+    for index_sql in _ACTIVITY_INDEXES:
+        db.execute(index_sql)
+
+
+# Backfills touching more rows than this drop and rebuild the affected index
+_BULK_BACKFILL_ROWS = 10000
 
 
-def _migrate_add_feeling_columns(db):
+class _SchemaInfo:
+    """Table columns and index names, read once per init_db run
+
+    Migrations consult this instead of issuing their own PRAGMA table_info /
+    sqlite_master queries, and record the DDL they apply so it stays current.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.tables = {}
+        for table, column in db.execute(
+            "SELECT m.name, p.name FROM sqlite_master m "
+            "JOIN pragma_table_info(m.name) p WHERE m.type = 'table'"
+        ):
+            self.tables.setdefault(table, set()).add(column)
+        self.indexes = {
+            row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+
+    def columns(self, table):
+        """Column names of a table (empty set if it doesn't exist)"""
+        columns = self.tables.get(table)
+        if columns is None:
+            # Created or rebuilt after the snapshot was taken
+            columns = {row[1] for row in self.db.execute(f'PRAGMA table_info({table})')}
+            if columns:
+                self.tables[table] = columns
+        return columns
+
+    def has_table(self, table):
+        return bool(self.columns(table))
+
+    def add_column(self, table, column):
+        self.columns(table).add(column)
+
+    def forget(self, *tables):
+        """Drop cached entries for tables that were dropped or rebuilt"""
+        for table in tables:
+            self.tables.pop(table, None)
+
+
+def _migrate_add_feeling_columns(db, schema):
     """Add feeling annotation columns and day_date to existing databases"""
-    # Get existing columns
-    cursor = db.execute("PRAGMA table_info(activities)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
+    existing_columns = schema.columns('activities')
 
     # Define new columns to add
     new_columns = [
@@ -284,29 +364,39 @@ def _migrate_add_feeling_columns(db):
     for column_name, column_type in new_columns:
         if column_name not in existing_columns:
             db.execute(f'ALTER TABLE activities ADD COLUMN {column_name} {column_type}')
+            existing_columns.add(column_name)
+
+    # Populate day_date for existing activities that don't have it set.
+    # For a large backfill, rebuilding idx_day_date once afterwards is cheaper
+    # than updating it row by row.
+    pending = db.execute(
+        'SELECT COUNT(*) FROM activities WHERE day_date IS NULL AND start_date_local IS NOT NULL'
+    ).fetchone()[0]
+    if not pending:
+        return
+
+    rebuild_index = pending > _BULK_BACKFILL_ROWS and 'idx_day_date' in schema.indexes
+    if rebuild_index:
+        db.execute('DROP INDEX idx_day_date')
 
-    # Populate day_date for existing activities that don't have it set
     db.execute('''
         UPDATE activities
         SET day_date = substr(start_date_local, 1, 10)
         WHERE day_date IS NULL AND start_date_local IS NOT NULL
     ''')
 
-    db.commit()
+    if rebuild_index:
+        db.execute('CREATE INDEX idx_day_date ON activities(day_date)')
 
 
-def _migrate_add_coach_comment_columns(db):
+def _migrate_add_coach_comment_columns(db, schema):
     """Add coach_comment column to days table for existing databases"""
-    # Check if coach_comment column exists in days table
-    cursor = db.execute("PRAGMA table_info(days)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
-
-    if 'coach_comment' not in existing_columns:
+    if 'coach_comment' not in schema.columns('days'):
         db.execute('ALTER TABLE days ADD COLUMN coach_comment TEXT')
-        db.commit()
+        schema.add_column('days', 'coach_comment')
 
 
-def _migrate_add_extended_activity_types(db):
+def _migrate_add_extended_activity_types(db, schema):
     """Add extended activity types and planned activities support"""
 
     # 1. Create extended_activity_types table
@@ -330,11 +420,9 @@ def _migrate_add_extended_activity_types(db):
     db.execute('CREATE INDEX IF NOT EXISTS idx_extended_types_active ON extended_activity_types(is_active)')
 
     # 2. Add extended_type_id to activities table (migration-safe)
-    cursor = db.execute("PRAGMA table_info(activities)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
-
-    if 'extended_type_id' not in existing_columns:
+    if 'extended_type_id' not in schema.columns('activities'):
         db.execute('ALTER TABLE activities ADD COLUMN extended_type_id INTEGER REFERENCES extended_activity_types(id) ON DELETE SET NULL')
+        schema.add_column('activities', 'extended_type_id')
         db.execute('CREATE INDEX IF NOT EXISTS idx_activities_extended_type ON activities(extended_type_id)')
 
     # 4. Seed with common extended types (optional - only on first run)
@@ -351,17 +439,146 @@ def _migrate_add_extended_activity_types(db):
             ('Ride', 'Recovery Ride', 'Active recovery spin', None, 'badge-recovery', 12),
         ]
 
-        for base, name, desc, icon, color, order in seed_types:
-            db.execute('''
-                INSERT INTO extended_activity_types
-                (base_sport_type, custom_name, description, icon_override, color_class, display_order)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (base, name, desc, icon, color, order))
-
-    db.commit()
-
-
-def _migrate_add_standard_activity_types(db):
+        db.executemany('''
+            INSERT INTO extended_activity_types
+            (base_sport_type, custom_name, description, icon_override, color_class, display_order)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', seed_types)
+
+
+# Standard Strava sport types:
+# (name, category, display_name, icon, color, description, is_official, display_order)
+_STANDARD_TYPES = (
+    # FOOT SPORTS
+    ('Run', 'Foot', 'Run', 'person-running', 'badge-sport-run', 'Running', 1, 10),
+    ('TrailRun', 'Foot', 'Trail Run', 'person-hiking', 'badge-sport-run', 'Trail running', 1, 11),
+    ('Walk', 'Foot', 'Walk', 'person-walking', 'badge-sport-walk', 'Walking', 1, 12),
+    ('Hike', 'Foot', 'Hike', 'mountain', 'badge-sport-hike', 'Hiking', 1, 13),
+    ('VirtualRun', 'Foot', 'Virtual Run', 'tv', 'badge-sport-run', 'Virtual/treadmill run', 1, 14),
+
+    # CYCLE SPORTS
+    ('Ride', 'Cycle', 'Ride', 'person-biking', 'badge-sport-ride', 'Road cycling', 1, 20),
+    ('MountainBikeRide', 'Cycle', 'Mountain Bike Ride', 'mountain', 'badge-sport-ride', 'Mountain biking', 1, 21),
+    ('GravelRide', 'Cycle', 'Gravel Ride', 'road', 'badge-sport-ride', 'Gravel cycling', 1, 22),
+    ('EBikeRide', 'Cycle', 'E-Bike Ride', 'bolt', 'badge-sport-ride', 'Electric bike', 1, 23),
+    ('EMountainBikeRide', 'Cycle', 'E-Mountain Bike Ride', 'bolt', 'badge-sport-ride', 'E-mountain bike', 1, 24),
+    ('Velomobile', 'Cycle', 'Velomobile', 'car-side', 'badge-sport-ride', 'Velomobile', 1, 25),
+    ('VirtualRide', 'Cycle', 'Virtual Ride', 'tv', 'badge-sport-ride', 'Virtual/trainer ride', 1, 26),
+    ('Handcycle', 'Cycle', 'Handcycle', 'wheelchair', 'badge-sport-ride', 'Hand cycling', 1, 27),
+
+    # WATER SPORTS
+    ('Swim', 'Water', 'Swim', 'person-swimming', 'badge-sport-swim', 'Swimming', 1, 30),
+    ('Canoe', 'Water', 'Canoe', 'water', 'badge-sport-water', 'Canoeing', 1, 31),
+    ('Kayaking', 'Water', 'Kayaking', 'water', 'badge-sport-water', 'Kayaking', 1, 32),
+    ('Kitesurf', 'Water', 'Kitesurf', 'wind', 'badge-sport-water', 'Kitesurfing', 1, 33),
+    ('Rowing', 'Water', 'Rowing', 'water', 'badge-sport-water', 'Rowing', 1, 34),
+    ('StandUpPaddling', 'Water', 'Stand Up Paddling', 'water', 'badge-sport-water', 'SUP', 1, 35),
+    ('Surfing', 'Water', 'Surfing', 'water', 'badge-sport-water', 'Surfing', 1, 36),
+    ('Windsurf', 'Water', 'Windsurf', 'wind', 'badge-sport-water', 'Windsurfing', 1, 37),
+    ('Sail', 'Water', 'Sail', 'sailboat', 'badge-sport-water', 'Sailing', 1, 38),
+    ('VirtualRow', 'Water', 'Virtual Row', 'tv', 'badge-sport-water', 'Indoor rowing', 1, 39),
+
+    # WINTER SPORTS
+    ('IceSkate', 'Winter', 'Ice Skate', 'snowflake', 'badge-sport-winter', 'Ice skating', 1, 40),
+    ('AlpineSki', 'Winter', 'Alpine Ski', 'person-skiing', 'badge-sport-winter', 'Downhill skiing', 1, 41),
+    ('BackcountrySki', 'Winter', 'Backcountry Ski', 'mountain', 'badge-sport-winter', 'Backcountry skiing', 1, 42),
+    ('NordicSki', 'Winter', 'Nordic Ski', 'person-skiing-nordic', 'badge-sport-winter', 'Cross-country skiing', 1, 43),
+    ('Snowboard', 'Winter', 'Snowboard', 'person-snowboarding', 'badge-sport-winter', 'Snowboarding', 1, 44),
+    ('Snowshoe', 'Winter', 'Snowshoe', 'shoe-prints', 'badge-sport-winter', 'Snowshoeing', 1, 45),
+
+    # FITNESS & GYM
+    ('WeightTraining', 'Fitness', 'Weight Training', 'dumbbell', 'badge-sport-weighttraining', 'Weight training', 1, 50),
+    ('Workout', 'Fitness', 'Workout', 'heart-pulse', 'badge-sport-workout', 'General workout', 1, 51),
+    ('HIIT', 'Fitness', 'HIIT', 'fire', 'badge-sport-hiit', 'High-intensity intervals', 1, 52),
+    ('Crossfit', 'Fitness', 'CrossFit', 'dumbbell', 'badge-sport-crossfit', 'CrossFit', 1, 53),
+    ('Yoga', 'Fitness', 'Yoga', 'spa', 'badge-sport-yoga', 'Yoga', 1, 54),
+    ('Pilates', 'Fitness', 'Pilates', 'spa', 'badge-sport-pilates', 'Pilates', 1, 55),
+    ('Elliptical', 'Fitness', 'Elliptical', 'circle-dot', 'badge-sport-elliptical', 'Elliptical trainer', 1, 56),
+    ('StairStepper', 'Fitness', 'Stair Stepper', 'stairs', 'badge-sport-stairs', 'Stair stepper', 1, 57),
+
+    # RACKET SPORTS
+    ('Tennis', 'Racket', 'Tennis', 'table-tennis-paddle-ball', 'badge-sport-tennis', 'Tennis', 1, 60),
+    ('Pickleball', 'Racket', 'Pickleball', 'table-tennis-paddle-ball', 'badge-sport-pickleball', 'Pickleball', 1, 61),
+    ('Badminton', 'Racket', 'Badminton', 'shuttlecock', 'badge-sport-badminton', 'Badminton', 1, 62),
+    ('TableTennis', 'Racket', 'Table Tennis', 'table-tennis-paddle-ball', 'badge-sport-tabletennis', 'Table tennis', 1, 63),
+    ('Squash', 'Racket', 'Squash', 'square', 'badge-sport-squash', 'Squash', 1, 64),
+    ('Racquetball', 'Racket', 'Racquetball', 'circle', 'badge-sport-racquetball', 'Racquetball', 1, 65),
+
+    # OTHER SPORTS
+    ('RockClimbing', 'Other', 'Rock Climbing', 'mountain', 'badge-sport-climbing', 'Rock climbing', 1, 70),
+    ('InlineSkate', 'Other', 'Inline Skate', 'shoe-prints', 'badge-sport-inlineskate', 'Inline skating', 1, 71),
+    ('RollerSki', 'Other', 'Roller Ski', 'person-skiing', 'badge-sport-rollerski', 'Roller skiing', 1, 72),
+    ('Golf', 'Other', 'Golf', 'golf-ball-tee', 'badge-sport-golf', 'Golf', 1, 73),
+    ('Skateboard', 'Other', 'Skateboard', 'person-skating', 'badge-sport-skateboard', 'Skateboarding', 1, 74),
+    ('Soccer', 'Other', 'Soccer', 'futbol', 'badge-sport-soccer', 'Soccer/Football', 1, 75),
+    ('Wheelchair', 'Other', 'Wheelchair', 'wheelchair', 'badge-sport-wheelchair', 'Wheelchair activity', 1, 76),
+)
+
+# Extended types for trend sports, added by the standard types migration:
+# (base_sport_type, custom_name, description, icon_override, color_class, display_order)
+_NEW_EXTENDED_TYPES = (
+    # HIIT
+    ('HIIT', 'Tabata', '20s work / 10s rest intervals', 'stopwatch', 'badge-sport-hiit', 100),
+    ('HIIT', 'EMOM', 'Every minute on the minute', 'clock', 'badge-sport-hiit', 101),
+    ('HIIT', 'AMRAP', 'As many rounds as possible', 'fire', 'badge-sport-hiit', 102),
+    ('HIIT', 'Circuit Training', 'Multi-station circuit', 'circle-nodes', 'badge-sport-hiit', 103),
+    ('HIIT', 'Interval Sprint', 'Short maximum effort', 'bolt', 'badge-sport-hiit', 104),
+
+    # CROSSFIT
+    ('Crossfit', 'WOD', 'Workout of the day', 'calendar-day', 'badge-sport-crossfit', 110),
+    ('Crossfit', 'MetCon', 'Metabolic conditioning', 'heart-pulse', 'badge-sport-crossfit', 111),
+    ('Crossfit', 'Strength WOD', 'Strength-focused session', 'dumbbell', 'badge-sport-crossfit', 112),
+    ('Crossfit', 'Olympic Lifting', 'Clean, snatch, etc.', 'weight-hanging', 'badge-sport-crossfit', 113),
+    ('Crossfit', 'Hero WOD', 'Named hero workout', 'medal', 'badge-sport-crossfit', 114),
+    ('Crossfit', 'Girls WOD', 'Classic benchmark', 'trophy', 'badge-sport-crossfit', 115),
+
+    # YOGA
+    ('Yoga', 'Vinyasa Yoga', 'Dynamic flow yoga', 'water', 'badge-sport-yoga', 120),
+    ('Yoga', 'Hatha Yoga', 'Traditional gentle yoga', 'spa', 'badge-sport-yoga', 121),
+    ('Yoga', 'Power Yoga', 'Athletic fitness yoga', 'fire', 'badge-sport-yoga', 122),
+    ('Yoga', 'Restorative Yoga', 'Relaxing passive stretching', 'bed', 'badge-sport-yoga', 123),
+    ('Yoga', 'Yin Yoga', 'Deep long-held stretches', 'moon', 'badge-sport-yoga', 124),
+    ('Yoga', 'Hot Yoga', 'Heated room yoga', 'temperature-high', 'badge-sport-yoga', 125),
+    ('Yoga', 'Ashtanga Yoga', 'Structured sequence', 'list-ol', 'badge-sport-yoga', 126),
+
+    # SWIMMING
+    ('Swim', 'Pool Swim', 'Swimming in pool', 'person-swimming', 'badge-sport-swim', 130),
+    ('Swim', 'Open Water Swim', 'Ocean/lake swimming', 'water', 'badge-sport-swim', 131),
+    ('Swim', 'Technique Work', 'Drills and form practice', 'graduation-cap', 'badge-sport-swim', 132),
+    ('Swim', 'Endurance Swim', 'Long continuous swim', 'gauge-high', 'badge-sport-swim', 133),
+    ('Swim', 'Interval Swim', 'Interval training', 'stopwatch', 'badge-sport-swim', 134),
+    ('Swim', 'Recovery Swim', 'Easy recovery swim', 'heart', 'badge-sport-swim', 135),
+
+    # PICKLEBALL
+    ('Pickleball', 'Singles Pickleball', 'One-on-one match', 'user', 'badge-sport-pickleball', 140),
+    ('Pickleball', 'Doubles Pickleball', 'Two-on-two match', 'user-group', 'badge-sport-pickleball', 141),
+    ('Pickleball', 'Pickleball Drills', 'Skills practice', 'bullseye', 'badge-sport-pickleball', 142),
+    ('Pickleball', 'Tournament Pickleball', 'Competitive play', 'trophy', 'badge-sport-pickleball', 143),
+
+    # ROCK CLIMBING
+    ('RockClimbing', 'Bouldering', 'Short powerful climbing', 'mountain', 'badge-sport-climbing', 150),
+    ('RockClimbing', 'Sport Climbing', 'Lead with bolted routes', 'link', 'badge-sport-climbing', 151),
+    ('RockClimbing', 'Top Rope', 'Anchor at top', 'arrow-up', 'badge-sport-climbing', 152),
+    ('RockClimbing', 'Trad Climbing', 'Traditional gear-protected', 'tools', 'badge-sport-climbing', 153),
+    ('RockClimbing', 'Indoor Climbing', 'Gym climbing', 'building', 'badge-sport-climbing', 154),
+    ('RockClimbing', 'Outdoor Climbing', 'Natural rock', 'tree', 'badge-sport-climbing', 155),
+
+    # TENNIS
+    ('Tennis', 'Singles Tennis', 'One-on-one match', 'user', 'badge-sport-tennis', 160),
+    ('Tennis', 'Doubles Tennis', 'Two-on-two match', 'user-group', 'badge-sport-tennis', 161),
+    ('Tennis', 'Tennis Practice', 'Drills and practice', 'bullseye', 'badge-sport-tennis', 162),
+    ('Tennis', 'Tennis Match', 'Competitive match', 'trophy', 'badge-sport-tennis', 163),
+
+    # WEIGHT TRAINING
+    ('WeightTraining', 'Upper Body', 'Upper body strength', 'hand-fist', 'badge-sport-weighttraining', 170),
+    ('WeightTraining', 'Lower Body', 'Lower body strength', 'shoe-prints', 'badge-sport-weighttraining', 171),
+    ('WeightTraining', 'Full Body', 'Full body session', 'person', 'badge-sport-weighttraining', 172),
+    ('WeightTraining', 'Powerlifting', 'Squat, bench, deadlift', 'weight-hanging', 'badge-sport-weighttraining', 173),
+    ('WeightTraining', 'Bodybuilding', 'Hypertrophy training', 'dumbbell', 'badge-sport-weighttraining', 174),
+)
+
+
+def _migrate_add_standard_activity_types(db, schema):
     """Add standard_activity_types table and FK constraints
 
     This is a comprehensive migration that:
@@ -373,10 +590,7 @@ def _migrate_add_standard_activity_types(db):
     """
 
     # Check if migration already completed (table exists AND has data)
-    cursor = db.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='standard_activity_types'"
-    )
-    if cursor.fetchone():
+    if schema.has_table('standard_activity_types'):
         # Table exists, check if it has data
         cursor = db.execute("SELECT COUNT(*) FROM standard_activity_types")
         count = cursor.fetchone()[0]
@@ -385,6 +599,7 @@ def _migrate_add_standard_activity_types(db):
             return
         # Table exists but is empty, drop it and recreate
         db.execute('DROP TABLE IF EXISTS standard_activity_types')
+        schema.forget('standard_activity_types')
 
     # STEP 1: Create standard_activity_types table
     db.execute('''
@@ -404,100 +619,41 @@ def _migrate_add_standard_activity_types(db):
     db.execute('CREATE INDEX idx_standard_types_category ON standard_activity_types(category)')
 
     # STEP 2: Populate standard types (all 50+ Strava sport types)
-    standard_types = [
-        # FOOT SPORTS
-        ('Run', 'Foot', 'Run', 'person-running', 'badge-sport-run', 'Running', 1, 10),
-        ('TrailRun', 'Foot', 'Trail Run', 'person-hiking', 'badge-sport-run', 'Trail running', 1, 11),
-        ('Walk', 'Foot', 'Walk', 'person-walking', 'badge-sport-walk', 'Walking', 1, 12),
-        ('Hike', 'Foot', 'Hike', 'mountain', 'badge-sport-hike', 'Hiking', 1, 13),
-        ('VirtualRun', 'Foot', 'Virtual Run', 'tv', 'badge-sport-run', 'Virtual/treadmill run', 1, 14),
-
-        # CYCLE SPORTS
-        ('Ride', 'Cycle', 'Ride', 'person-biking', 'badge-sport-ride', 'Road cycling', 1, 20),
-        ('MountainBikeRide', 'Cycle', 'Mountain Bike Ride', 'mountain', 'badge-sport-ride', 'Mountain biking', 1, 21),
-        ('GravelRide', 'Cycle', 'Gravel Ride', 'road', 'badge-sport-ride', 'Gravel cycling', 1, 22),
-        ('EBikeRide', 'Cycle', 'E-Bike Ride', 'bolt', 'badge-sport-ride', 'Electric bike', 1, 23),
-        ('EMountainBikeRide', 'Cycle', 'E-Mountain Bike Ride', 'bolt', 'badge-sport-ride', 'E-mountain bike', 1, 24),
-        ('Velomobile', 'Cycle', 'Velomobile', 'car-side', 'badge-sport-ride', 'Velomobile', 1, 25),
-        ('VirtualRide', 'Cycle', 'Virtual Ride', 'tv', 'badge-sport-ride', 'Virtual/trainer ride', 1, 26),
-        ('Handcycle', 'Cycle', 'Handcycle', 'wheelchair', 'badge-sport-ride', 'Hand cycling', 1, 27),
-
-        # WATER SPORTS
-        ('Swim', 'Water', 'Swim', 'person-swimming', 'badge-sport-swim', 'Swimming', 1, 30),
-        ('Canoe', 'Water', 'Canoe', 'water', 'badge-sport-water', 'Canoeing', 1, 31),
-        ('Kayaking', 'Water', 'Kayaking', 'water', 'badge-sport-water', 'Kayaking', 1, 32),
-        ('Kitesurf', 'Water', 'Kitesurf', 'wind', 'badge-sport-water', 'Kitesurfing', 1, 33),
-        ('Rowing', 'Water', 'Rowing', 'water', 'badge-sport-water', 'Rowing', 1, 34),
-        ('StandUpPaddling', 'Water', 'Stand Up Paddling', 'water', 'badge-sport-water', 'SUP', 1, 35),
-        ('Surfing', 'Water', 'Surfing', 'water', 'badge-sport-water', 'Surfing', 1, 36),
-        ('Windsurf', 'Water', 'Windsurf', 'wind', 'badge-sport-water', 'Windsurfing', 1, 37),
-        ('Sail', 'Water', 'Sail', 'sailboat', 'badge-sport-water', 'Sailing', 1, 38),
-        ('VirtualRow', 'Water', 'Virtual Row', 'tv', 'badge-sport-water', 'Indoor rowing', 1, 39),
-
-        # WINTER SPORTS
-        ('IceSkate', 'Winter', 'Ice Skate', 'snowflake', 'badge-sport-winter', 'Ice skating', 1, 40),
-        ('AlpineSki', 'Winter', 'Alpine Ski', 'person-skiing', 'badge-sport-winter', 'Downhill skiing', 1, 41),
-        ('BackcountrySki', 'Winter', 'Backcountry Ski', 'mountain', 'badge-sport-winter', 'Backcountry skiing', 1, 42),
-        ('NordicSki', 'Winter', 'Nordic Ski', 'person-skiing-nordic', 'badge-sport-winter', 'Cross-country skiing', 1, 43),
-        ('Snowboard', 'Winter', 'Snowboard', 'person-snowboarding', 'badge-sport-winter', 'Snowboarding', 1, 44),
-        ('Snowshoe', 'Winter', 'Snowshoe', 'shoe-prints', 'badge-sport-winter', 'Snowshoeing', 1, 45),
-
-        # FITNESS & GYM
-        ('WeightTraining', 'Fitness', 'Weight Training', 'dumbbell', 'badge-sport-weighttraining', 'Weight training', 1, 50),
-        ('Workout', 'Fitness', 'Workout', 'heart-pulse', 'badge-sport-workout', 'General workout', 1, 51),
-        ('HIIT', 'Fitness', 'HIIT', 'fire', 'badge-sport-hiit', 'High-intensity intervals', 1, 52),
-        ('Crossfit', 'Fitness', 'CrossFit', 'dumbbell', 'badge-sport-crossfit', 'CrossFit', 1, 53),
-        ('Yoga', 'Fitness', 'Yoga', 'spa', 'badge-sport-yoga', 'Yoga', 1, 54),
-        ('Pilates', 'Fitness', 'Pilates', 'spa', 'badge-sport-pilates', 'Pilates', 1, 55),
-        ('Elliptical', 'Fitness', 'Elliptical', 'circle-dot', 'badge-sport-elliptical', 'Elliptical trainer', 1, 56),
-        ('StairStepper', 'Fitness', 'Stair Stepper', 'stairs', 'badge-sport-stairs', 'Stair stepper', 1, 57),
-
-        # RACKET SPORTS
-        ('Tennis', 'Racket', 'Tennis', 'table-tennis-paddle-ball', 'badge-sport-tennis', 'Tennis', 1, 60),
-        ('Pickleball', 'Racket', 'Pickleball', 'table-tennis-paddle-ball', 'badge-sport-pickleball', 'Pickleball', 1, 61),
-        ('Badminton', 'Racket', 'Badminton', 'shuttlecock', 'badge-sport-badminton', 'Badminton', 1, 62),
-        ('TableTennis', 'Racket', 'Table Tennis', 'table-tennis-paddle-ball', 'badge-sport-tabletennis', 'Table tennis', 1, 63),
-        ('Squash', 'Racket', 'Squash', 'square', 'badge-sport-squash', 'Squash', 1, 64),
-        ('Racquetball', 'Racket', 'Racquetball', 'circle', 'badge-sport-racquetball', 'Racquetball', 1, 65),
-
-        # OTHER SPORTS
-        ('RockClimbing', 'Other', 'Rock Climbing', 'mountain', 'badge-sport-climbing', 'Rock climbing', 1, 70),
-        ('InlineSkate', 'Other', 'Inline Skate', 'shoe-prints', 'badge-sport-inlineskate', 'Inline skating', 1, 71),
-        ('RollerSki', 'Other', 'Roller Ski', 'person-skiing', 'badge-sport-rollerski', 'Roller skiing', 1, 72),
-        ('Golf', 'Other', 'Golf', 'golf-ball-tee', 'badge-sport-golf', 'Golf', 1, 73),
-        ('Skateboard', 'Other', 'Skateboard', 'person-skating', 'badge-sport-skateboard', 'Skateboarding', 1, 74),
-        ('Soccer', 'Other', 'Soccer', 'futbol', 'badge-sport-soccer', 'Soccer/Football', 1, 75),
-        ('Wheelchair', 'Other', 'Wheelchair', 'wheelchair', 'badge-sport-wheelchair', 'Wheelchair activity', 1, 76),
-    ]
-
     db.executemany('''
         INSERT INTO standard_activity_types
         (name, category, display_name, icon, color, description, is_official, display_order)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', standard_types)
+    ''', _STANDARD_TYPES)
 
     # STEP 3: Handle orphaned sport types from existing activities
-    cursor = db.execute('''
-        SELECT DISTINCT sport_type FROM activities
-        WHERE sport_type NOT IN (SELECT name FROM standard_activity_types)
-        AND sport_type IS NOT NULL
+    # (one INSERT ... SELECT with an anti-join on the standard_activity_types
+    # primary key, rather than fetching them and inserting row by row)
+    db.execute('''
+        INSERT INTO standard_activity_types
+        (name, category, display_name, icon, color, is_official, display_order)
+        SELECT DISTINCT a.sport_type, 'Other', a.sport_type, 'circle-question', 'badge-other', 0, 999
+        FROM activities a
+        LEFT JOIN standard_activity_types s ON s.name = a.sport_type
+        WHERE s.name IS NULL
+        AND a.sport_type IS NOT NULL
     ''')
-    orphaned = [row[0] for row in cursor.fetchall()]
 
-    for sport_type in orphaned:
-        db.execute('''
-            INSERT INTO standard_activity_types
-            (name, category, display_name, icon, color, is_official, display_order)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (sport_type, 'Other', sport_type, 'circle-question', 'badge-other', 0, 999))
+    # Give the table copies and index builds below a bigger page cache so
+    # they run from memory; restored once the rebuilt tables are in place
+    previous_cache_size = db.execute('PRAGMA cache_size').fetchone()[0]
+    db.execute('PRAGMA cache_size = -262144')  # 256 MB
 
     # STEP 4: Recreate activities table with FK constraint
     # Check if activities table already has extended_type_id column
-    cursor = db.execute("PRAGMA table_info(activities)")
-    has_extended_type_id = any(col[1] == 'extended_type_id' for col in cursor.fetchall())
+    has_extended_type_id = 'extended_type_id' in schema.columns('activities')
 
     db.execute('ALTER TABLE activities RENAME TO activities_old')
 
+    # Drop old indexes if they exist (they follow the renamed table). Done
+    # before the copy so the old table carries no indexes into it.
+    for index_name in ['idx_start_date', 'idx_sport_type', 'idx_type', 'idx_day_date', 'idx_gear_id', 'idx_activities_extended_type']:
+        db.execute(f'DROP INDEX IF EXISTS {index_name}')
+
     # Build CREATE TABLE statement dynamically
     create_statement = '''
         CREATE TABLE activities (
@@ -581,13 +737,9 @@ def _migrate_add_standard_activity_types(db):
     '''
     db.execute(create_statement)
 
-    # Copy data
+    # Copy data, then build the indexes on the filled table
     db.execute('INSERT INTO activities SELECT * FROM activities_old')
 
-    # Drop old indexes if they exist (they may be associated with the old table)
-    for index_name in ['idx_start_date', 'idx_sport_type', 'idx_type', 'idx_day_date', 'idx_gear_id', 'idx_activities_extended_type']:
-        db.execute(f'DROP INDEX IF EXISTS {index_name}')
-
     # Recreate indexes
     db.execute('CREATE INDEX idx_start_date ON activities(start_date)')
     db.execute('CREATE INDEX idx_sport_type ON activities(sport_type)')
@@ -601,6 +753,10 @@ def _migrate_add_standard_activity_types(db):
     # STEP 5: Recreate extended_activity_types table with FK constraint
     db.execute('ALTER TABLE extended_activity_types RENAME TO extended_activity_types_old')
 
+    # Drop old indexes if they exist
+    db.execute('DROP INDEX IF EXISTS idx_extended_types_base')
+    db.execute('DROP INDEX IF EXISTS idx_extended_types_active')
+
     db.execute('''
         CREATE TABLE extended_activity_types (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -620,114 +776,40 @@ def _migrate_add_standard_activity_types(db):
 
     db.execute('INSERT INTO extended_activity_types SELECT * FROM extended_activity_types_old')
 
-    # Drop old indexes if they exist
-    db.execute('DROP INDEX IF EXISTS idx_extended_types_base')
-    db.execute('DROP INDEX IF EXISTS idx_extended_types_active')
-
     db.execute('CREATE INDEX idx_extended_types_base ON extended_activity_types(base_sport_type)')
     db.execute('CREATE INDEX idx_extended_types_active ON extended_activity_types(is_active)')
 
     db.execute('DROP TABLE extended_activity_types_old')
+    schema.forget('activities', 'extended_activity_types')
+    db.execute(f'PRAGMA cache_size = {previous_cache_size}')
 
     # STEP 6: Add new extended types (70+ types for trend sports)
-    new_extended_types = [
-        # HIIT
-        ('HIIT', 'Tabata', '20s work / 10s rest intervals', 'stopwatch', 'badge-sport-hiit', 100),
-        ('HIIT', 'EMOM', 'Every minute on the minute', 'clock', 'badge-sport-hiit', 101),
-        ('HIIT', 'AMRAP', 'As many rounds as possible', 'fire', 'badge-sport-hiit', 102),
-        ('HIIT', 'Circuit Training', 'Multi-station circuit', 'circle-nodes', 'badge-sport-hiit', 103),
-        ('HIIT', 'Interval Sprint', 'Short maximum effort', 'bolt', 'badge-sport-hiit', 104),
-
-        # CROSSFIT
-        ('Crossfit', 'WOD', 'Workout of the day', 'calendar-day', 'badge-sport-crossfit', 110),
-        ('Crossfit', 'MetCon', 'Metabolic conditioning', 'heart-pulse', 'badge-sport-crossfit', 111),
-        ('Crossfit', 'Strength WOD', 'Strength-focused session', 'dumbbell', 'badge-sport-crossfit', 112),
-        ('Crossfit', 'Olympic Lifting', 'Clean, snatch, etc.', 'weight-hanging', 'badge-sport-crossfit', 113),
-        ('Crossfit', 'Hero WOD', 'Named hero workout', 'medal', 'badge-sport-crossfit', 114),
-        ('Crossfit', 'Girls WOD', 'Classic benchmark', 'trophy', 'badge-sport-crossfit', 115),
-
-        # YOGA
-        ('Yoga', 'Vinyasa Yoga', 'Dynamic flow yoga', 'water', 'badge-sport-yoga', 120),
-        ('Yoga', 'Hatha Yoga', 'Traditional gentle yoga', 'spa', 'badge-sport-yoga', 121),
-        ('Yoga', 'Power Yoga', 'Athletic fitness yoga', 'fire', 'badge-sport-yoga', 122),
-        ('Yoga', 'Restorative Yoga', 'Relaxing passive stretching', 'bed', 'badge-sport-yoga', 123),
-        ('Yoga', 'Yin Yoga', 'Deep long-held stretches', 'moon', 'badge-sport-yoga', 124),
-        ('Yoga', 'Hot Yoga', 'Heated room yoga', 'temperature-high', 'badge-sport-yoga', 125),
-        ('Yoga', 'Ashtanga Yoga', 'Structured sequence', 'list-ol', 'badge-sport-yoga', 126),
-
-        # SWIMMING
-        ('Swim', 'Pool Swim', 'Swimming in pool', 'person-swimming', 'badge-sport-swim', 130),
-        ('Swim', 'Open Water Swim', 'Ocean/lake swimming', 'water', 'badge-sport-swim', 131),
-        ('Swim', 'Technique Work', 'Drills and form practice', 'graduation-cap', 'badge-sport-swim', 132),
-        ('Swim', 'Endurance Swim', 'Long continuous swim', 'gauge-high', 'badge-sport-swim', 133),
-        ('Swim', 'Interval Swim', 'Interval training', 'stopwatch', 'badge-sport-swim', 134),
-        ('Swim', 'Recovery Swim', 'Easy recovery swim', 'heart', 'badge-sport-swim', 135),
-
-        # PICKLEBALL
-        ('Pickleball', 'Singles Pickleball', 'One-on-one match', 'user', 'badge-sport-pickleball', 140),
-        ('Pickleball', 'Doubles Pickleball', 'Two-on-two match', 'user-group', 'badge-sport-pickleball', 141),
-        ('Pickleball', 'Pickleball Drills', 'Skills practice', 'bullseye', 'badge-sport-pickleball', 142),
-        ('Pickleball', 'Tournament Pickleball', 'Competitive play', 'trophy', 'badge-sport-pickleball', 143),
-
-        # ROCK CLIMBING
-        ('RockClimbing', 'Bouldering', 'Short powerful climbing', 'mountain', 'badge-sport-climbing', 150),
-        ('RockClimbing', 'Sport Climbing', 'Lead with bolted routes', 'link', 'badge-sport-climbing', 151),
-        ('RockClimbing', 'Top Rope', 'Anchor at top', 'arrow-up', 'badge-sport-climbing', 152),
-        ('RockClimbing', 'Trad Climbing', 'Traditional gear-protected', 'tools', 'badge-sport-climbing', 153),
-        ('RockClimbing', 'Indoor Climbing', 'Gym climbing', 'building', 'badge-sport-climbing', 154),
-        ('RockClimbing', 'Outdoor Climbing', 'Natural rock', 'tree', 'badge-sport-climbing', 155),
-
-        # TENNIS
-        ('Tennis', 'Singles Tennis', 'One-on-one match', 'user', 'badge-sport-tennis', 160),
-        ('Tennis', 'Doubles Tennis', 'Two-on-two match', 'user-group', 'badge-sport-tennis', 161),
-        ('Tennis', 'Tennis Practice', 'Drills and practice', 'bullseye', 'badge-sport-tennis', 162),
-        ('Tennis', 'Tennis Match', 'Competitive match', 'trophy', 'badge-sport-tennis', 163),
-
-        # WEIGHT TRAINING
-        ('WeightTraining', 'Upper Body', 'Upper body strength', 'hand-fist', 'badge-sport-weighttraining', 170),
-        ('WeightTraining', 'Lower Body', 'Lower body strength', 'shoe-prints', 'badge-sport-weighttraining', 171),
-        ('WeightTraining', 'Full Body', 'Full body session', 'person', 'badge-sport-weighttraining', 172),
-        ('WeightTraining', 'Powerlifting', 'Squat, bench, deadlift', 'weight-hanging', 'badge-sport-weighttraining', 173),
-        ('WeightTraining', 'Bodybuilding', 'Hypertrophy training', 'dumbbell', 'badge-sport-weighttraining', 174),
-    ]
-
-    for base_type, name, desc, icon, color, order in new_extended_types:
-        try:
-            db.execute('''
-                INSERT INTO extended_activity_types
-                (base_sport_type, custom_name, description, icon_override, color_class, display_order)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (base_type, name, desc, icon, color, order))
-        except Exception:
-            # Skip if already exists (UNIQUE constraint on custom_name)
-            pass
-
-    db.commit()
+    # OR IGNORE skips types that already exist (UNIQUE constraint on custom_name)
+    db.executemany('''
+        INSERT OR IGNORE INTO extended_activity_types
+        (base_sport_type, custom_name, description, icon_override, color_class, display_order)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', _NEW_EXTENDED_TYPES)
 
 
-def _migrate_remove_planned_activities(db):
+def _migrate_remove_planned_activities(db, schema):
     """Remove old planned_activities table if it has the legacy schema (no user_id column).
 
     The original table lacked user_id and other columns needed by the current planning
     feature. If the new schema is already in place, this migration is a no-op so that
     existing data is preserved across app restarts and deployments.
     """
-    cursor = db.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='planned_activities'"
-    )
-    if not cursor.fetchone():
+    columns = schema.columns('planned_activities')
+    if not columns:
         return  # table doesn't exist yet — nothing to do
 
-    cursor = db.execute("PRAGMA table_info(planned_activities)")
-    columns = {row[1] for row in cursor.fetchall()}
-
     if 'user_id' not in columns:
         # Old schema without user_id — drop so _migrate_add_planning_feature can recreate
         db.execute('DROP TABLE planned_activities')
-        db.commit()
+        schema.forget('planned_activities')
 
 
-def _migrate_add_planning_feature(db):
+def _migrate_add_planning_feature(db, schema):
     """Add planned_activities table for training plan feature"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS planned_activities (
@@ -747,10 +829,9 @@ def _migrate_add_planning_feature(db):
     ''')
     db.execute('CREATE INDEX IF NOT EXISTS idx_planned_user_date ON planned_activities(user_id, day_date)')
     db.execute('CREATE INDEX IF NOT EXISTS idx_planned_sort ON planned_activities(day_date, sort_order)')
-    db.commit()
 
 
-def _migrate_cleanup_root_sport_types(db):
+def _migrate_cleanup_root_sport_types(db, schema):
     """Remove root='XYZ' entries from standard_activity_types.
 
     When the Strava API returns raw enum strings like root='Run', the standard
@@ -768,50 +849,41 @@ def _migrate_cleanup_root_sport_types(db):
     if not bad_rows:
         return
 
+    pairs = []
     for raw_name in bad_rows:
         m = re.match(r"^root='(.+)'$", raw_name)
-        if not m:
-            continue
-        clean_name = m.group(1)
+        if m:
+            pairs.append((m.group(1), raw_name))
+    if not pairs:
+        return
 
-        cursor = db.execute(
-            'SELECT name FROM standard_activity_types WHERE name = ?', (clean_name,)
+    existing = {
+        row[0] for row in db.execute(
+            'SELECT name FROM standard_activity_types WHERE name IN ({})'.format(
+                ','.join('?' * len(pairs))
+            ),
+            [clean for clean, _ in pairs]
         )
-        if cursor.fetchone():
-            # Clean entry exists — remap activities and drop the bad row
-            db.execute(
-                'UPDATE activities SET sport_type = ? WHERE sport_type = ?',
-                (clean_name, raw_name)
-            )
-            db.execute(
-                'UPDATE planned_activities SET sport_type = ? WHERE sport_type = ?',
-                (clean_name, raw_name)
-            )
-            db.execute(
-                'DELETE FROM standard_activity_types WHERE name = ?', (raw_name,)
-            )
-        else:
-            # No clean entry — rename the row in place
-            db.execute(
-                'UPDATE standard_activity_types SET name = ?, display_name = ? WHERE name = ?',
-                (clean_name, clean_name, raw_name)
-            )
-            db.execute(
-                'UPDATE activities SET sport_type = ? WHERE sport_type = ?',
-                (clean_name, raw_name)
-            )
-            db.execute(
-                'UPDATE planned_activities SET sport_type = ? WHERE sport_type = ?',
-                (clean_name, raw_name)
-            )
+    }
 
-    db.commit()
+    # No clean entry — rename the row in place
+    db.executemany(
+        'UPDATE standard_activity_types SET name = ?, display_name = ? WHERE name = ?',
+        [(clean, clean, raw) for clean, raw in pairs if clean not in existing]
+    )
+    # Remap activities and plans in one batch per table
+    db.executemany('UPDATE activities SET sport_type = ? WHERE sport_type = ?', pairs)
+    db.executemany('UPDATE planned_activities SET sport_type = ? WHERE sport_type = ?', pairs)
+    # Clean entry exists — drop the bad row
+    db.executemany(
+        'DELETE FROM standard_activity_types WHERE name = ?',
+        [(raw,) for clean, raw in pairs if clean in existing]
+    )
 
 
-def _migrate_add_archive_columns(db):
+def _migrate_add_archive_columns(db, schema):
     """Add columns for Strava archive import data (weather, grades, etc.)"""
-    cursor = db.execute("PRAGMA table_info(activities)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
+    existing_columns = schema.columns('activities')
 
     new_columns = [
         # Performance extras
@@ -863,11 +935,10 @@ def _migrate_add_archive_columns(db):
     for column_name, column_type in new_columns:
         if column_name not in existing_columns:
             db.execute(f'ALTER TABLE activities ADD COLUMN {column_name} {column_type}')
-
-    db.commit()
+            existing_columns.add(column_name)
 
 
-def _migrate_add_invitations_table(db):
+def _migrate_add_invitations_table(db, schema):
     """Add invitations table for token-based invitation-only registration"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS invitations (
@@ -891,10 +962,9 @@ def _migrate_add_invitations_table(db):
     db.execute('CREATE INDEX IF NOT EXISTS idx_invitations_inviter ON invitations(inviter_id)')
     db.execute('CREATE INDEX IF NOT EXISTS idx_invitations_email ON invitations(invited_email)')
     db.execute('CREATE INDEX IF NOT EXISTS idx_invitations_status ON invitations(status)')
-    db.commit()
 
 
-def _migrate_add_api_keys_table(db):
+def _migrate_add_api_keys_table(db, schema):
     """Add api_keys table for MCP server authentication"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS api_keys (
@@ -910,10 +980,9 @@ def _migrate_add_api_keys_table(db):
     ''')
     db.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_user ON api_keys(user_id)')
     db.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_hash ON api_keys(key_hash)')
-    db.commit()
 
 
-def _migrate_add_training_templates(db):
+def _migrate_add_training_templates(db, schema):
     """Add training_templates and template_segments tables"""
     db.execute('''
         CREATE TABLE IF NOT EXISTS training_templates (
@@ -944,18 +1013,44 @@ def _migrate_add_training_templates(db):
         )
     ''')
     db.execute('CREATE INDEX IF NOT EXISTS idx_template_segments_template ON template_segments(template_id, sort_order)')
-    db.commit()
 
 
-def _migrate_add_template_to_planned(db):
+def _migrate_add_template_to_planned(db, schema):
     """Add template_id column to planned_activities"""
-    cursor = db.execute("PRAGMA table_info(planned_activities)")
-    columns = [row[1] for row in cursor.fetchall()]
-    if 'template_id' not in columns:
+    if 'template_id' not in schema.columns('planned_activities'):
         db.execute(
             'ALTER TABLE planned_activities ADD COLUMN template_id INTEGER REFERENCES training_templates(id) ON DELETE SET NULL'
         )
-        db.commit()
+        schema.add_column('planned_activities', 'template_id')
+
+
+# Every step of _create_schema(), in order. Each must be idempotent: all of
+# them run again whenever SCHEMA_VERSION changes. Schema changes for existing
+# databases go in a new step appended here, which also bumps the version.
+_MIGRATIONS = (
+    _create_activities_table,
+    _migrate_add_feeling_columns,
+    _create_days_table,
+    _migrate_add_coach_comment_columns,
+    _migrate_add_extended_activity_types,
+    _migrate_add_standard_activity_types,
+    _migrate_remove_planned_activities,
+    _migrate_add_planning_feature,
+    _migrate_cleanup_root_sport_types,
+    _migrate_add_archive_columns,
+    _migrate_add_invitations_table,
+    _migrate_add_api_keys_table,
+    _migrate_add_training_templates,
+    _migrate_add_template_to_planned,
+    _create_activity_media_table,
+    _create_strava_tokens_table,
+    _create_gear_table,
+    _create_activity_indexes,
+)
+
+# Stored in PRAGMA user_version once _create_schema has run; derived from the
+# step list so appending a step makes existing databases run it
+SCHEMA_VERSION = len(_MIGRATIONS)
 
 
 def get_extended_types(base_sport_type=None):
@@ -978,6 +1073,11 @@ def get_extended_types(base_sport_type=None):
     return [db_row_to_dict(row) for row in cursor.fetchall()]
 
 
+def _is_missing_table(error):
+    """True if an OperationalError is SQLite's 'no such table'"""
+    return str(error).startswith('no such table')
+
+
 def get_standard_activity_types(category=None, official_only=True):
     """Fetch standard activity types, optionally filtered by category
 
@@ -990,13 +1090,6 @@ def get_standard_activity_types(category=None, official_only=True):
     """
     db = get_db()
 
-    # Check if table exists
-    cursor = db.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='standard_activity_types'"
-    )
-    if not cursor.fetchone():
-        return []
-
     query = 'SELECT * FROM standard_activity_types WHERE 1=1'
     params = []
 
@@ -1009,7 +1102,13 @@ def get_standard_activity_types(category=None, official_only=True):
 
     query += ' ORDER BY display_order, display_name'
 
-    cursor = db.execute(query, params)
+    try:
+        cursor = db.execute(query, params)
+    except sqlite3.OperationalError as e:
+        # Table doesn't exist yet (checked here instead of a sqlite_master lookup per call)
+        if _is_missing_table(e):
+            return []
+        raise
     return [db_row_to_dict(row) for row in cursor.fetchall()]
 
 
@@ -1044,18 +1143,16 @@ def validate_sport_type(sport_type):
 
     db = get_db()
 
-    # Check if table exists
-    cursor = db.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='standard_activity_types'"
-    )
-    if not cursor.fetchone():
+    try:
+        cursor = db.execute(
+            'SELECT COUNT(*) FROM standard_activity_types WHERE name = ?',
+            (sport_type,)
+        )
+    except sqlite3.OperationalError as e:
         # If migration hasn't run yet, allow any sport_type
-        return True
-
-    cursor = db.execute(
-        'SELECT COUNT(*) FROM standard_activity_types WHERE name = ?',
-        (sport_type,)
-    )
+        if _is_missing_table(e):
+            return True
+        raise
     return cursor.fetchone()[0] > 0
 
 
@@ -2,9 +2,90 @@
 
 from datetime import datetime
 from .base import BaseRepository
+from app.utils.database_helpers import cursor_rows_to_json
 from app.utils.errors import ActivityNotFoundError, ValidationError, DatabaseError
 
 
+_ACTIVITIES_SELECT = '''
+    SELECT
+        a.*,
+        ext.custom_name as extended_name,
+        ext.color_class as extended_color,
+        ext.icon_override as extended_icon
+    FROM activities a
+    LEFT JOIN extended_activity_types ext ON a.extended_type_id = ext.id
+    WHERE 1=1
+'''
+
+_ACTIVITIES_FILTER_SQL = {
+    'user_id': ' AND a.user_id = ?',
+    'sport_type': ' AND a.sport_type = ?',
+    'day_date': ' AND a.day_date = ?',
+    'start_date': ' AND a.start_date >= ?',
+    'end_date': ' AND a.start_date <= ?',
+    'gear_id': ' AND a.gear_id = ?',
+    'extended_type_id': ' AND a.extended_type_id = ?',
+}
+
+# get_activities SQL keyed by filter shape (tuple of present filter names)
+_ACTIVITIES_SQL_CACHE = {}
+
+
+def _build_activities_query(shape):
+    """Assemble the get_activities SQL for a given filter shape"""
+    query = _ACTIVITIES_SELECT + ''.join(
+        _ACTIVITIES_FILTER_SQL[key] for key in shape if key in _ACTIVITIES_FILTER_SQL
+    )
+    # Order by start date (most recent first)
+    query += ' ORDER BY a.start_date DESC'
+    if 'limit' in shape:
+        query += ' LIMIT ?'
+    if 'offset' in shape:
+        query += ' OFFSET ?'
+    return query
+
+
+def _activities_query(filters, limit, offset, user_id):
+    """Return (query, params) for get_activities / get_activities_json"""
+    if filters is None:
+        filters = {}
+
+    # Collect bind values in a fixed order; the SQL text only depends on
+    # which filters are present, so it is built once per shape and cached.
+    params = []
+    shape = []
+
+    # Filter by user_id (critical for multi-user support)
+    if user_id is not None:
+        params.append(user_id)
+        shape.append('user_id')
+
+    for key in ('sport_type', 'day_date', 'start_date', 'end_date', 'gear_id', 'extended_type_id'):
+        # day_date takes precedence over the date range
+        if key in ('start_date', 'end_date') and filters.get('day_date'):
+            continue
+        if filters.get(key):
+            params.append(filters[key])
+            shape.append(key)
+
+    # Pagination
+    if limit is not None:
+        params.append(limit)
+        shape.append('limit')
+
+    if offset:
+        params.append(offset)
+        shape.append('offset')
+
+    shape = tuple(shape)
+    query = _ACTIVITIES_SQL_CACHE.get(shape)
+    if query is None:
+        query = _build_activities_query(shape)
+        _ACTIVITIES_SQL_CACHE[shape] = query
+
+    return query, params
+
+
 class ActivityRepository(BaseRepository):
     """Repository for activity CRUD operations and queries"""
 
@@ -62,66 +143,26 @@ class ActivityRepository(BaseRepository):
         Returns:
             List of activity dictionaries
         """
-        if filters is None:
-            filters = {}
-
-        # Build query
-        query = '''
-            SELECT
-                a.*,
-                ext.custom_name as extended_name,
-                ext.color_class as extended_color,
-                ext.icon_override as extended_icon
-            FROM activities a
-            LEFT JOIN extended_activity_types ext ON a.extended_type_id = ext.id
-            WHERE 1=1
-        '''
-        params = []
-
-        # Filter by user_id (critical for multi-user support)
-        if user_id is not None:
-            query += ' AND a.user_id = ?'
-            params.append(user_id)
-
-        # Apply filters
-        if filters.get('sport_type'):
-            query += ' AND a.sport_type = ?'
-            params.append(filters['sport_type'])
-
-        if filters.get('day_date'):
-            query += ' AND a.day_date = ?'
-            params.append(filters['day_date'])
-        else:
-            # Date range filtering
-            if filters.get('start_date'):
-                query += ' AND a.start_date >= ?'
-                params.append(filters['start_date'])
-
-            if filters.get('end_date'):
-                query += ' AND a.start_date <= ?'
-                params.append(filters['end_date'])
-
-        if filters.get('gear_id'):
-            query += ' AND a.gear_id = ?'
-            params.append(filters['gear_id'])
-
-        if filters.get('extended_type_id'):
-            query += ' AND a.extended_type_id = ?'
-            params.append(filters['extended_type_id'])
+        query, params = _activities_query(filters, limit, offset, user_id)
+        return self.fetchall(query, params)
 
-        # Order by start date (most recent first)
-        query += ' ORDER BY a.start_date DESC'
+    def get_activities_json(self, filters=None, limit=None, offset=0, user_id=None):
+        """Get activities like get_activities, serialized straight to a JSON array
 
-        # Pagination
-        if limit is not None:
-            query += ' LIMIT ?'
-            params.append(limit)
+        Rows are encoded as they are fetched instead of first building a list
+        of dictionaries.
 
-        if offset:
-            query += ' OFFSET ?'
-            params.append(offset)
+        Args:
+            filters: Dictionary of filter criteria (same as get_activities)
+            limit: Maximum number of results
+            offset: Number of results to skip
+            user_id: User ID to filter by (required for multi-user)
 
-        return self.fetchall(query, params)
+        Returns:
+            JSON array of activity objects as bytes
+        """
+        query, params = _activities_query(filters, limit, offset, user_id)
+        return cursor_rows_to_json(self.execute(query, params))
 
     def create_activity(self, data):
         """Create a new activity
@@ -158,20 +199,28 @@ class ActivityRepository(BaseRepository):
         # Return created activity
         return self.get_activity(activity_id)
 
-    def update_activity(self, activity_id, data):
+    def update_activity(self, activity_id, data, user_id=None):
         """Update an existing activity
 
         Args:
             activity_id: Activity ID
             data: Dictionary of fields to update
+            user_id: User ID (optional, for access control)
 
         Returns:
             Updated activity dictionary
 
         Raises:
-            ActivityNotFoundError: If activity doesn't exist
+            ActivityNotFoundError: If activity doesn't exist or access denied
             DatabaseError: If update fails
         """
+        if user_id is not None:
+            # Ownership is enforced by the UPDATE's WHERE clause, no pre-check needed
+            rows_affected = self.update('activities', data, id_value=activity_id, user_id=user_id)
+            if rows_affected == 0:
+                raise ActivityNotFoundError(activity_id)
+            return self.get_activity(activity_id)
+
         # Check if activity exists
         existing = self.get_by_id('activities', activity_id)
         if not existing:
@@ -207,11 +256,12 @@ class ActivityRepository(BaseRepository):
         self.delete('activities', id_value=activity_id)
         return True
 
-    def get_stats(self, filters=None):
+    def get_stats(self, filters=None, user_id=None):
         """Get activity statistics with optional filtering
 
         Args:
             filters: Dictionary of filter criteria (same as get_activities)
+            user_id: User ID to filter by (optional, for access control)
 
         Returns:
             Dictionary with aggregated statistics:
@@ -237,6 +287,10 @@ class ActivityRepository(BaseRepository):
         '''
         params = []
 
+        if user_id is not None:
+            query += ' AND user_id = ?'
+            params.append(user_id)
+
         # Apply filters
         if filters.get('sport_type'):
             query += ' AND sport_type = ?'
@@ -334,12 +388,18 @@ class ActivityRepository(BaseRepository):
         """
         return self.get_activities(filters={'day_date': day_date})
 
-    def search_activities(self, search_term, limit=50):
+    def search_activities(self, search_term, limit=50, user_id=None):
         """Search activities by name or description
 
+        Case-insensitive substring match done in SQL, so only the matching
+        rows (at most limit) are fetched. Both sides go through the casefold()
+        SQL function registered by configure_connection(), so non-ASCII
+        letters (Ä/ä, ß/ss) match across case as well.
+
         Args:
-            search_term: Search string
+            search_term: Search string (matched literally; % and _ are not wildcards)
             limit: Maximum results
+            user_id: User ID to filter by (optional, for access control)
 
         Returns:
             List of activity dictionaries
@@ -352,9 +412,18 @@ class ActivityRepository(BaseRepository):
                 ext.icon_override as extended_icon
             FROM activities a
             LEFT JOIN extended_activity_types ext ON a.extended_type_id = ext.id
-            WHERE a.name LIKE ? OR a.description LIKE ?
-            ORDER BY a.start_date DESC
-            LIMIT ?
+            WHERE (casefold(a.name) LIKE ? ESCAPE '!'
+                   OR casefold(a.description) LIKE ? ESCAPE '!')
         '''
-        search_pattern = f'%{search_term}%'
-        return self.fetchall(query, (search_pattern, search_pattern, limit))
+        escaped = search_term.casefold().replace('!', '!!').replace('%', '!%').replace('_', '!_')
+        search_pattern = f'%{escaped}%'
+        params = [search_pattern, search_pattern]
+
+        if user_id is not None:
+            query += ' AND a.user_id = ?'
+            params.append(user_id)
+
+        query += ' ORDER BY a.start_date DESC LIMIT ?'
+        params.append(limit)
+
+        return self.fetchall(query, params)
@@ -2,9 +2,13 @@
 
 import hashlib
 import secrets
-from datetime import datetime
+from datetime import datetime, timedelta
 from .base import BaseRepository
 
+# last_used_at is only shown per day; validate_key_with_user skips the write
+# (and its commit) when the stored value is more recent than this
+LAST_USED_REFRESH = timedelta(minutes=10)
+
 
 class ApiKeyRepository(BaseRepository):
     """Repository for API key CRUD operations"""
@@ -85,6 +89,68 @@ class ApiKeyRepository(BaseRepository):
 
         return {'user_id': row['user_id'], 'scope': row['scope']}
 
+    def validate_key_with_user(self, raw_key) -> dict | None:
+        """Validate a raw API key and fetch the owner's active flag in one query.
+
+        Like validate_key, but joins users so callers need no follow-up
+        lookup. Updates last_used_at on success, unless it was already
+        refreshed within LAST_USED_REFRESH.
+
+        Args:
+            raw_key: The full raw key string (e.g. "am_abc123...")
+
+        Returns:
+            Dict with {key_id, user_id, scope, is_active} if the key exists, None otherwise.
+        """
+        if not raw_key or not raw_key.startswith('am_'):
+            return None
+
+        key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+        row = self.fetchone(
+            '''SELECT ak.id, ak.user_id, ak.scope, ak.last_used_at, u.is_active
+               FROM api_keys ak
+               JOIN users u ON u.id = ak.user_id
+               WHERE ak.key_hash = ?''',
+            (key_hash,)
+        )
+        if not row:
+            return None
+
+        # Update last_used_at (ISO strings in one format compare chronologically)
+        now = datetime.utcnow()
+        if not row['last_used_at'] or row['last_used_at'] < (now - LAST_USED_REFRESH).isoformat():
+            db = self.get_db()
+            db.execute(
+                'UPDATE api_keys SET last_used_at = ? WHERE id = ?',
+                (now.isoformat(), row['id'])
+            )
+            db.commit()
+
+        return {
+            'key_id': row['id'],
+            'user_id': row['user_id'],
+            'scope': row['scope'],
+            'is_active': row['is_active'],
+        }
+
+    def get_key_owner_active(self, key_id) -> bool | None:
+        """Check that an API key still exists and whether its owner is active.
+
+        A single primary-key lookup; unlike validate_key_with_user it does
+        not hash the key or write last_used_at.
+
+        Returns:
+            The owner's is_active flag, or None if the key has been deleted.
+        """
+        row = self.fetchone(
+            '''SELECT u.is_active
+               FROM api_keys ak
+               JOIN users u ON u.id = ak.user_id
+               WHERE ak.id = ?''',
+            (key_id,)
+        )
+        return None if row is None else bool(row['is_active'])
+
     def get_keys_for_user(self, user_id) -> list:
         """Return API keys for a user (without hashes).
 
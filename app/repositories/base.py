@@ -4,7 +4,7 @@ from abc import ABC
 from datetime import datetime
 from flask import g
 from app.database import get_db
-from app.utils.database_helpers import db_row_to_dict, dict_to_db_values
+from app.utils.database_helpers import db_row_to_dict, cursor_rows_to_dicts, dict_to_db_values
 from app.utils.errors import DatabaseError
 
 
@@ -94,8 +94,7 @@ class BaseRepository(ABC):
             List of dictionaries
         """
         cursor = self.execute(query, params)
-        rows = cursor.fetchall()
-        return [db_row_to_dict(row) for row in rows]
+        return cursor_rows_to_dicts(cursor)
 
     def insert(self, table, data):
         """Insert a row into a table
@@ -129,7 +128,7 @@ class BaseRepository(ABC):
         except Exception as e:
             raise DatabaseError(f"Insert failed for table {table}: {str(e)}", e)
 
-    def update(self, table, data, id_column='id', id_value=None):
+    def update(self, table, data, id_column='id', id_value=None, user_id=None):
         """Update a row in a table
 
         Args:
@@ -137,6 +136,7 @@ class BaseRepository(ABC):
             data: Dictionary of column->value pairs to update
             id_column: Name of ID column (default: 'id')
             id_value: Value of ID to update
+            user_id: Only update the row if it belongs to this user (optional)
 
         Returns:
             Number of rows affected
@@ -163,10 +163,14 @@ class BaseRepository(ABC):
             # Build query
             set_clause = ', '.join([f'{col} = ?' for col in filtered_columns])
             query = f'UPDATE {table} SET {set_clause} WHERE {id_column} = ?'
+            all_values = filtered_values + [id_value]
+
+            if user_id is not None:
+                query += ' AND user_id = ?'
+                all_values.append(user_id)
 
             # Execute
             db = self.get_db()
-            all_values = filtered_values + [id_value]
             cursor = db.execute(query, all_values)
             if self._auto_commit:
                 db.commit()
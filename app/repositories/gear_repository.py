@@ -141,13 +141,15 @@ class GearRepository(BaseRepository):
                 - total_distance: Total distance in meters
                 - total_time: Total moving time in seconds
                 - total_elevation: Total elevation gain in meters
+                - total_distance_km: Total distance in km, rounded to 2 decimals
         """
         query = '''
             SELECT
                 COUNT(*) as total_activities,
                 SUM(distance) as total_distance,
                 SUM(moving_time) as total_time,
-                SUM(total_elevation_gain) as total_elevation
+                SUM(total_elevation_gain) as total_elevation,
+                ROUND(COALESCE(SUM(distance), 0) / 1000.0, 2) as total_distance_km
             FROM activities
             WHERE gear_id = ?
         '''
@@ -158,7 +160,8 @@ class GearRepository(BaseRepository):
             'total_activities': stats['total_activities'] or 0,
             'total_distance': stats['total_distance'] or 0,
             'total_time': stats['total_time'] or 0,
-            'total_elevation': stats['total_elevation'] or 0
+            'total_elevation': stats['total_elevation'] or 0,
+            'total_distance_km': stats['total_distance_km']
         }
 
     def get_gear_with_stats(self, gear_id):
@@ -191,16 +194,37 @@ class GearRepository(BaseRepository):
             is_active: Filter by active status
 
         Returns:
-            List of gear dictionaries with stats
+            List of gear dictionaries with stats (as get_gear_stats)
         """
-        all_gear = self.get_all_gear(is_active)
-
-        result = []
-        for gear in all_gear:
-            stats = self.get_gear_stats(gear['id'])
-            result.append({
-                **gear,
-                'stats': stats
-            })
+        # One grouped query instead of a stats query per gear item
+        query = '''
+            SELECT
+                g.*,
+                COUNT(a.id) as total_activities,
+                COALESCE(SUM(a.distance), 0) as total_distance,
+                COALESCE(SUM(a.moving_time), 0) as total_time,
+                COALESCE(SUM(a.total_elevation_gain), 0) as total_elevation,
+                ROUND(COALESCE(SUM(a.distance), 0) / 1000.0, 2) as total_distance_km
+            FROM gear g
+            LEFT JOIN activities a ON a.gear_id = g.id
+        '''
+        params = []
+
+        if is_active is not None:
+            query += ' WHERE g.is_active = ?'
+            params.append(1 if is_active else 0)
+
+        query += ' GROUP BY g.id ORDER BY g.name'
+
+        result = self.fetchall(query, params)
+        for gear in result:
+            gear['stats'] = {
+                'gear_id': gear['id'],
+                'total_activities': gear.pop('total_activities'),
+                'total_distance': gear.pop('total_distance'),
+                'total_time': gear.pop('total_time'),
+                'total_elevation': gear.pop('total_elevation'),
+                'total_distance_km': gear.pop('total_distance_km'),
+            }
 
         return result
@@ -5,57 +5,51 @@ from .base import BaseRepository
 from app.utils.errors import DatabaseError
 
 
+# Planned activity columns plus display fields from the joined tables
+_PLAN_SELECT = '''
+    SELECT p.*,
+           s.display_name as sport_display_name,
+           s.icon as sport_icon,
+           s.color as sport_color,
+           e.custom_name as extended_name,
+           e.color_class as extended_color,
+           a.name as matched_activity_name,
+           a.sport_type as matched_sport_type,
+           a.distance as matched_distance,
+           a.moving_time as matched_moving_time,
+           tt.name as template_name,
+           tt.sport_type as template_sport_type
+    FROM planned_activities p
+    LEFT JOIN standard_activity_types s ON p.sport_type = s.name
+    LEFT JOIN extended_activity_types e ON p.extended_type_id = e.id
+    LEFT JOIN activities a ON p.matched_activity_id = a.id
+    LEFT JOIN training_templates tt ON p.template_id = tt.id
+'''
+
+
 class PlannedActivityRepository(BaseRepository):
     """Repository for planned activity CRUD and ordering operations"""
 
     def get_by_day(self, day_date, user_id):
         """Get planned activities for a specific day, ordered by sort_order"""
-        return self.fetchall('''
-            SELECT p.*,
-                   s.display_name as sport_display_name,
-                   s.icon as sport_icon,
-                   s.color as sport_color,
-                   e.custom_name as extended_name,
-                   e.color_class as extended_color,
-                   a.name as matched_activity_name,
-                   a.sport_type as matched_sport_type,
-                   a.distance as matched_distance,
-                   a.moving_time as matched_moving_time,
-                   tt.name as template_name,
-                   tt.sport_type as template_sport_type
-            FROM planned_activities p
-            LEFT JOIN standard_activity_types s ON p.sport_type = s.name
-            LEFT JOIN extended_activity_types e ON p.extended_type_id = e.id
-            LEFT JOIN activities a ON p.matched_activity_id = a.id
-            LEFT JOIN training_templates tt ON p.template_id = tt.id
+        return self.fetchall(_PLAN_SELECT + '''
             WHERE p.user_id = ? AND p.day_date = ?
             ORDER BY p.sort_order ASC, p.id ASC
         ''', (user_id, day_date))
 
     def get_by_week(self, start_date, end_date, user_id):
         """Get planned activities for a date range, ordered by date then sort_order"""
-        return self.fetchall('''
-            SELECT p.*,
-                   s.display_name as sport_display_name,
-                   s.icon as sport_icon,
-                   s.color as sport_color,
-                   e.custom_name as extended_name,
-                   e.color_class as extended_color,
-                   a.name as matched_activity_name,
-                   a.sport_type as matched_sport_type,
-                   a.distance as matched_distance,
-                   a.moving_time as matched_moving_time,
-                   tt.name as template_name,
-                   tt.sport_type as template_sport_type
-            FROM planned_activities p
-            LEFT JOIN standard_activity_types s ON p.sport_type = s.name
-            LEFT JOIN extended_activity_types e ON p.extended_type_id = e.id
-            LEFT JOIN activities a ON p.matched_activity_id = a.id
-            LEFT JOIN training_templates tt ON p.template_id = tt.id
+        return self.fetchall(_PLAN_SELECT + '''
             WHERE p.user_id = ? AND p.day_date >= ? AND p.day_date <= ?
             ORDER BY p.day_date ASC, p.sort_order ASC, p.id ASC
         ''', (user_id, start_date, end_date))
 
+    def get_plan(self, plan_id, user_id):
+        """Get a single planned activity (with joined display fields) by ID, or None"""
+        return self.fetchone(_PLAN_SELECT + '''
+            WHERE p.id = ? AND p.user_id = ?
+        ''', (plan_id, user_id))
+
     def create(self, data):
         """Insert a new planned activity; auto-assigns sort_order as max+1 for the day"""
         user_id = data['user_id']
@@ -1,11 +1,33 @@
 """Strava service for handling Strava API interactions"""
 
+import re
 import time
 from datetime import datetime
+from functools import lru_cache
 from app.repositories import ActivityRepository, TypeRepository
 from app.utils.errors import StravaAPIError, RateLimitError, ValidationError
 from app.utils.database_helpers import dict_to_db_values
 
+_ROOT_RE = re.compile(r"^root='(.+)'$")
+_SLASH_RE = re.compile(r"^[^/]*/([^/]*)$")
+
+
+@lru_cache(maxsize=4096)
+def clean_sport_type(sport_type):
+    """Normalize a raw Strava sport type string
+
+    Handles "root='Run'" -> "Run" and enum paths such as
+    "relax/weighttraining" -> "Weighttraining" / "cycling/(mountain bike)" -> "MountainBike".
+    Memoized because the same handful of sport types repeats across a sync.
+    """
+    m = _ROOT_RE.match(sport_type)
+    if m:
+        return m.group(1)
+    m = _SLASH_RE.match(sport_type)
+    if not m:
+        return sport_type
+    return ''.join(word.capitalize() for word in m.group(1).replace('(', '').replace(')', '').split())
+
 
 class StravaService:
     """Service for Strava API operations and data synchronization"""
@@ -263,10 +285,8 @@ class StravaService:
         if not sport_type:
             sport_type = 'Workout'
         # Clean up sport type if it has the weird format
-        if isinstance(sport_type, str) and '/' in sport_type:
-            parts = sport_type.split('/')
-            if len(parts) == 2:
-                sport_type = ''.join(word.capitalize() for word in parts[1].replace('(', '').replace(')', '').split())
+        if isinstance(sport_type, str):
+            sport_type = clean_sport_type(sport_type)
         activity_data['sport_type'] = sport_type
 
         # Time fields
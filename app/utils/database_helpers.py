@@ -4,6 +4,8 @@ import json
 from collections import defaultdict
 from datetime import datetime
 
+import orjson
+
 
 def dict_to_db_values(data):
     """Convert dictionary to database-friendly values (serialize JSON fields)
@@ -37,6 +39,30 @@ def dict_to_db_values(data):
     return columns, values
 
 
+# Columns stored as JSON text and columns stored as 0/1 integers
+_JSON_FIELDS = ('start_latlng', 'end_latlng', 'map', 'segment_efforts',
+                'splits_metric', 'splits_standard', 'laps', 'best_efforts', 'gear')
+_BOOL_FIELDS = ('trainer', 'commute', 'manual', 'private', 'flagged',
+                'has_heartrate', 'has_kudoed', 'segment_leaderboard_opt_out',
+                'leaderboard_opt_out', 'device_watts', 'is_active', 'is_official')
+
+
+def _convert_fields(result, json_fields, bool_fields):
+    """Parse JSON fields and convert boolean fields of a row dict in place"""
+    # Parse JSON fields
+    for field in json_fields:
+        if result[field]:
+            try:
+                result[field] = json.loads(result[field])
+            except Exception:
+                pass
+
+    # Convert boolean fields
+    for field in bool_fields:
+        if result[field] is not None:
+            result[field] = bool(result[field])
+
+
 def db_row_to_dict(row):
     """Convert database row to dictionary with JSON fields parsed
 
@@ -49,29 +75,78 @@ def db_row_to_dict(row):
     if row is None:
         return None
 
-    json_fields = ['start_latlng', 'end_latlng', 'map', 'segment_efforts',
-                   'splits_metric', 'splits_standard', 'laps', 'best_efforts', 'gear']
-
     result = dict(row)
+    _convert_fields(result,
+                    [f for f in _JSON_FIELDS if f in result],
+                    [f for f in _BOOL_FIELDS if f in result])
+    return result
 
-    # Parse JSON fields
-    for field in json_fields:
-        if field in result and result[field]:
-            try:
-                result[field] = json.loads(result[field])
-            except Exception:
-                pass
 
-    # Convert boolean fields
-    bool_fields = ['trainer', 'commute', 'manual', 'private', 'flagged',
-                   'has_heartrate', 'has_kudoed', 'segment_leaderboard_opt_out',
-                   'leaderboard_opt_out', 'device_watts', 'is_active', 'is_official']
+def cursor_rows_to_dicts(cursor):
+    """Fetch all rows of an executed cursor as dictionaries
 
-    for field in bool_fields:
-        if field in result and result[field] is not None:
-            result[field] = bool(result[field])
+    Same conversions as db_row_to_dict, but column names and the JSON/boolean
+    columns present are resolved once per result set instead of once per row,
+    and rows are fetched as plain tuples.
 
-    return result
+    Args:
+        cursor: Executed SQLite cursor
+
+    Returns:
+        List of dictionaries
+    """
+    if cursor.description is None:
+        return []
+
+    columns = [d[0] for d in cursor.description]
+    json_fields = [f for f in _JSON_FIELDS if f in columns]
+    bool_fields = [f for f in _BOOL_FIELDS if f in columns]
+
+    # Skip sqlite3.Row construction; zip the shared column list with each tuple
+    cursor.row_factory = None
+    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    if json_fields or bool_fields:
+        for result in results:
+            _convert_fields(result, json_fields, bool_fields)
+
+    return results
+
+
+def cursor_rows_to_json(cursor, batch_size=100):
+    """Serialize all rows of an executed cursor to a JSON array
+
+    Rows get the same conversions as cursor_rows_to_dicts, but are encoded one
+    at a time into a single buffer, so no list of row dicts is ever built.
+
+    Args:
+        cursor: Executed SQLite cursor
+        batch_size: Rows fetched per fetchmany() call
+
+    Returns:
+        JSON array as bytes
+    """
+    if cursor.description is None:
+        return b'[]'
+
+    columns = [d[0] for d in cursor.description]
+    json_fields = [f for f in _JSON_FIELDS if f in columns]
+    bool_fields = [f for f in _BOOL_FIELDS if f in columns]
+
+    cursor.row_factory = None
+    buf = bytearray(b'[')
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            result = dict(zip(columns, row))
+            _convert_fields(result, json_fields, bool_fields)
+            if len(buf) > 1:
+                buf += b','
+            buf += orjson.dumps(result)
+    buf += b']'
+    return bytes(buf)
 
 
 def parse_datetime(value):
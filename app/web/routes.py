@@ -3,6 +3,7 @@ from flask_login import login_required, current_user
 import csv
 import io
 import os
+import orjson
 from datetime import datetime, timedelta
 from app.web import web_bp
 from app.database import (
@@ -23,6 +24,11 @@ from app.services.access_control_service import get_viewing_user_id, can_view_us
 from app.auth.decorators import athlete_required
 
 
+def _json(obj, status=200):
+    """Serialize obj with orjson into a JSON response (faster than jsonify)"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
 @web_bp.route('/')
 @login_required
 def index():
@@ -206,15 +212,13 @@ def sync():
 @athlete_required
 def api_sync_activities():
     """AJAX: Step 1 - Sync activity summary data"""
-    from flask import jsonify
-
     # Get viewing user ID
     viewing_user_id = get_viewing_user_id()
 
     try:
         client = get_strava_client()
     except Exception:
-        return jsonify({'error': 'Please connect to Strava first'}), 401
+        return _json({'error': 'Please connect to Strava first'}, 401)
 
     try:
         from app.services.strava_service import StravaService
@@ -232,7 +236,7 @@ def api_sync_activities():
         ''', (viewing_user_id,))
         needs_descriptions = cursor.fetchone()['count']
 
-        return jsonify({
+        return _json({
             'success': True,
             'created': result['created'],
             'updated': result['updated'],
@@ -240,7 +244,7 @@ def api_sync_activities():
         })
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
 
 
 @web_bp.route('/api/sync/description/<int:activity_id>', methods=['POST'])
@@ -248,15 +252,13 @@ def api_sync_activities():
 @athlete_required
 def api_sync_description(activity_id):
     """AJAX: Step 2 - Fetch description for a single activity"""
-    from flask import jsonify
-
     # Get viewing user ID
     viewing_user_id = get_viewing_user_id()
 
     try:
         client = get_strava_client()
     except Exception:
-        return jsonify({'error': 'Not authenticated'}), 401
+        return _json({'error': 'Not authenticated'}, 401)
 
     try:
         db = get_db()
@@ -265,7 +267,7 @@ def api_sync_description(activity_id):
         cursor = db.execute('SELECT user_id FROM activities WHERE id = ?', (activity_id,))
         activity = cursor.fetchone()
         if not activity or activity['user_id'] != viewing_user_id:
-            return jsonify({'error': 'Activity not found'}), 404
+            return _json({'error': 'Activity not found'}, 404)
 
         detailed = client.get_activity(activity_id)
 
@@ -292,20 +294,18 @@ def api_sync_description(activity_id):
                 (description, datetime.utcnow().isoformat(), activity_id, viewing_user_id)
             )
             db.commit()
-            return jsonify({'success': True, 'has_description': True})
+            return _json({'success': True, 'has_description': True})
 
-        return jsonify({'success': True, 'has_description': False})
+        return _json({'success': True, 'has_description': False})
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, 500)
 
 
 @web_bp.route('/api/sync/activities-needing-descriptions', methods=['GET'])
 @login_required
 def api_activities_needing_descriptions():
     """AJAX: Get list of activity IDs needing descriptions"""
-    from flask import jsonify
-
     # Get viewing user ID
     viewing_user_id = get_viewing_user_id()
 
@@ -318,7 +318,7 @@ def api_activities_needing_descriptions():
     ''', (viewing_user_id,))
     activities = [row['id'] for row in cursor.fetchall()]
 
-    return jsonify({'activity_ids': activities})
+    return _json({'activity_ids': activities})
 
 
 @web_bp.route('/activity/<int:activity_id>')
@@ -1,18 +1,70 @@
 import os
+import importlib.util
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Base directory of the application
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
+# Written by scripts/compile_env.py
+ENV_CACHE_PATH = os.path.join(BASE_DIR, 'env_cache.py')
+
+
+def _load_env_cache(env_path):
+    """Return the ENV dict from ENV_CACHE_PATH, or None if it is missing or stale
+
+    The cache is loaded from its explicit path (never via sys.path) and is
+    ignored when env_path has been modified after it was generated.
+    """
+    try:
+        cache_mtime = os.path.getmtime(ENV_CACHE_PATH)
+    except OSError:
+        return None
+    try:
+        if os.path.getmtime(env_path) > cache_mtime:
+            return None
+    except OSError:
+        pass  # No .env next to the cache; use the cache as is
+    spec = importlib.util.spec_from_file_location('env_cache', ENV_CACHE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ENV
+
+
+@lru_cache(maxsize=1)
+def ensure_dotenv_loaded(path=None):
+    """Load the .env file into os.environ, parsing it at most once per process
+
+    If env_cache.py (generated by scripts/compile_env.py) exists next to this
+    file and is newer than .env, its precompiled ENV dict is used instead of
+    parsing .env. As with load_dotenv, variables already set in the
+    environment take precedence.
+
+    Set AM_SKIP_DOTENV=1 when the process environment is already complete
+    (systemd, docker) to skip loading entirely.
+    """
+    if os.environ.get('AM_SKIP_DOTENV'):
+        return
+    env_path = path or os.path.join(BASE_DIR, '.env')
+    if path is None:
+        env = _load_env_cache(env_path)
+        if env is not None:
+            for key, value in env.items():
+                os.environ.setdefault(key, value)
+            return
+    if os.path.exists(env_path):
+        load_dotenv(env_path)
+
+
+# Load environment variables from .env file
+ensure_dotenv_loaded()
+
 
 def _normalize_host(host):
     """Ensure HOST has a proper URL scheme (http:// or https://)"""
     if not host:
         return 'http://localhost:5000'
-    if not host.startswith('http://') and not host.startswith('https://'):
+    if not host.startswith(('http://', 'https://')):
         # Default to http:// for localhost, https:// for everything else
         if 'localhost' in host or '127.0.0.1' in host:
             return f'http://{host}'
@@ -20,47 +72,52 @@ def _normalize_host(host):
     return host
 
 
+# Read environment once at import time
+_E = os.environ.get
+_HOST = _normalize_host(_E('HOST'))
+
+
 class Config:
     """Base configuration class"""
 
     # Flask
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = _E('SECRET_KEY') or 'dev-secret-key-change-in-production'
 
     # Session Configuration
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
-    PERMANENT_SESSION_LIFETIME = int(os.environ.get('SESSION_LIFETIME', 86400))  # 24 hours default
-    REMEMBER_COOKIE_DURATION = int(os.environ.get('REMEMBER_ME_DURATION', 2592000))  # 30 days default
+    PERMANENT_SESSION_LIFETIME = int(_E('SESSION_LIFETIME', 86400))  # 24 hours default
+    REMEMBER_COOKIE_DURATION = int(_E('REMEMBER_ME_DURATION', 2592000))  # 30 days default
 
     # Host configuration (used for OAuth callbacks)
     # In production, set HOST to your full URL (e.g., https://activity.example.com)
-    HOST = _normalize_host(os.environ.get('HOST'))
+    HOST = _HOST
 
     # Database
-    DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(BASE_DIR, "activities.db")
+    DATABASE_PATH = _E('DATABASE_PATH') or os.path.join(BASE_DIR, "activities.db")
 
     # Strava API Credentials
-    STRAVA_CLIENT_ID = os.environ.get('STRAVA_CLIENT_ID')
-    STRAVA_CLIENT_SECRET = os.environ.get('STRAVA_CLIENT_SECRET')
-    STRAVA_ACCESS_TOKEN = os.environ.get('STRAVA_ACCESS_TOKEN')
-    STRAVA_REFRESH_TOKEN = os.environ.get('STRAVA_REFRESH_TOKEN')
+    STRAVA_CLIENT_ID = _E('STRAVA_CLIENT_ID')
+    STRAVA_CLIENT_SECRET = _E('STRAVA_CLIENT_SECRET')
+    STRAVA_ACCESS_TOKEN = _E('STRAVA_ACCESS_TOKEN')
+    STRAVA_REFRESH_TOKEN = _E('STRAVA_REFRESH_TOKEN')
 
     # Strava OAuth
     STRAVA_AUTHORIZE_URL = 'https://www.strava.com/oauth/authorize'
     STRAVA_TOKEN_URL = 'https://www.strava.com/oauth/token'
     STRAVA_API_BASE_URL = 'https://www.strava.com/api/v3'
     # Redirect URI built from HOST, or can be overridden directly
-    STRAVA_REDIRECT_URI = os.environ.get('STRAVA_REDIRECT_URI') or f"{_normalize_host(os.environ.get('HOST'))}/auth/strava/callback"
+    STRAVA_REDIRECT_URI = _E('STRAVA_REDIRECT_URI') or f"{_HOST}/auth/strava/callback"
 
     # Email Configuration
-    SMTP_SERVER = os.environ.get('SMTP_SERVER')
-    SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
-    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
-    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
-    FROM_EMAIL = os.environ.get('FROM_EMAIL') or os.environ.get('SMTP_USERNAME')
+    SMTP_SERVER = _E('SMTP_SERVER')
+    SMTP_PORT = int(_E('SMTP_PORT', 587))
+    SMTP_USERNAME = _E('SMTP_USERNAME')
+    SMTP_PASSWORD = _E('SMTP_PASSWORD')
+    FROM_EMAIL = _E('FROM_EMAIL') or _E('SMTP_USERNAME')
 
     # Invitation Configuration
-    INVITATION_EXPIRY_DAYS = int(os.environ.get('INVITATION_EXPIRY_DAYS', 30))
+    INVITATION_EXPIRY_DAYS = int(_E('INVITATION_EXPIRY_DAYS', 30))
 
 
 class DevelopmentConfig(Config):
@@ -79,9 +136,9 @@ class ProductionConfig(Config):
 
     # In production, all sensitive values should come from environment variables
     # Remove the fallback defaults for security
-    SECRET_KEY = os.environ.get('SECRET_KEY')
-    STRAVA_CLIENT_ID = os.environ.get('STRAVA_CLIENT_ID')
-    STRAVA_CLIENT_SECRET = os.environ.get('STRAVA_CLIENT_SECRET')
+    SECRET_KEY = _E('SECRET_KEY')
+    STRAVA_CLIENT_ID = _E('STRAVA_CLIENT_ID')
+    STRAVA_CLIENT_SECRET = _E('STRAVA_CLIENT_SECRET')
 
 
 # Configuration dictionary
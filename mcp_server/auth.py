@@ -1,24 +1,31 @@
 """API key authentication and per-request auth context."""
 
+import hashlib
 import sqlite3
-from contextvars import ContextVar
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
 from typing import Optional
 
 from app.repositories.api_key_repository import ApiKeyRepository
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AuthContext:
     user_id: int
     scope: str
+    # Derived from scope once; contexts are immutable and shared via the cache.
+    can_write: bool = field(init=False)
 
-    def can_write(self) -> bool:
-        return self.scope == "readwrite"
+    def __post_init__(self):
+        object.__setattr__(self, "can_write", self.scope == "readwrite")
 
 
 # Per-async-task (per-request) auth context — set by middleware or server startup.
 _current_auth: ContextVar[Optional[AuthContext]] = ContextVar("current_auth", default=None)
+# Bound once so every tool call skips the attribute lookup on the ContextVar.
+_get_auth = _current_auth.get
 
 
 def get_current_auth() -> AuthContext:
@@ -27,20 +34,77 @@ def get_current_auth() -> AuthContext:
     Raises:
         PermissionError: If no auth context has been set (unauthenticated request).
     """
-    auth = _current_auth.get()
+    auth = _get_auth()
     if auth is None:
         raise PermissionError("Unauthenticated — missing or invalid API key")
     return auth
 
 
-def set_current_auth(auth: AuthContext) -> None:
-    """Set the AuthContext for the current async task."""
-    _current_auth.set(auth)
+def set_current_auth(auth: AuthContext) -> Token:
+    """Set the AuthContext for the current async task.
+
+    Returns:
+        Token to pass to reset_current_auth() once the request is done.
+    """
+    return _current_auth.set(auth)
+
+
+def reset_current_auth(token: Token) -> None:
+    """Restore the auth context that was active before set_current_auth()."""
+    _current_auth.reset(token)
+
+
+# Recently validated keys: blake2b(raw_key) -> (expires_at, api key id, AuthContext).
+# A hit skips hashing and the last_used_at write, but still re-checks the key
+# row and the owner's is_active flag: keys are revoked and users deactivated
+# from the Flask process, which cannot reach this cache.
+_VALIDATION_CACHE: "OrderedDict[str, tuple[float, int, AuthContext]]" = OrderedDict()
+_VALIDATION_CACHE_MAX = 1024
+_VALIDATION_CACHE_TTL = 30.0  # seconds
+
+
+def _cache_key(raw_key: str) -> str:
+    return hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
+
+
+def cached_auth(conn: sqlite3.Connection, raw_key: str) -> Optional[AuthContext]:
+    """Return the cached AuthContext for raw_key, or None if it is not cached.
+
+    A cached key is still checked against the database with one primary-key
+    lookup (no hashing, no write), so deleting the key or deactivating its
+    owner takes effect on the next request.
+
+    Raises:
+        PermissionError: If the cached key was deleted or its user deactivated.
+    """
+    cache_key = _cache_key(raw_key)
+    cached = _VALIDATION_CACHE.get(cache_key)
+    if cached is None:
+        return None
+    expires_at, key_id, auth = cached
+    if time.monotonic() >= expires_at:
+        del _VALIDATION_CACHE[cache_key]
+        return None
+
+    is_active = ApiKeyRepository(db=conn).get_key_owner_active(key_id)
+    if is_active:
+        _VALIDATION_CACHE.move_to_end(cache_key)
+        return auth
+    del _VALIDATION_CACHE[cache_key]
+    if is_active is None:
+        raise PermissionError("Invalid API key")
+    raise PermissionError("User account is not active")
 
 
 def resolve_auth(conn: sqlite3.Connection, raw_key: str) -> AuthContext:
     """Validate the raw API key and return an AuthContext.
 
+    Successful validations are cached in-process (LRU-bounded) for
+    _VALIDATION_CACHE_TTL seconds and re-checked on every hit (see
+    cached_auth). Only a miss runs the full validation, which may write
+    last_used_at; a hit is read-only. Rejections are never cached, so a
+    newly created key works immediately.
+
     Args:
         conn: Open sqlite3 connection.
         raw_key: The value of AM_API_KEY from the environment.
@@ -54,18 +118,21 @@ def resolve_auth(conn: sqlite3.Connection, raw_key: str) -> AuthContext:
     if not raw_key or not raw_key.startswith("am_"):
         raise PermissionError("AM_API_KEY is missing or malformed (must start with 'am_')")
 
-    repo = ApiKeyRepository(db=conn)
-    result = repo.validate_key(raw_key)
+    auth = cached_auth(conn, raw_key)
+    if auth is not None:
+        return auth
+
+    result = ApiKeyRepository(db=conn).validate_key_with_user(raw_key)
 
     if result is None:
         raise PermissionError("Invalid API key")
 
-    # Verify the user is active
-    cursor = conn.execute(
-        "SELECT is_active FROM users WHERE id = ?", (result["user_id"],)
-    )
-    row = cursor.fetchone()
-    if not row or not row["is_active"]:
+    if not result["is_active"]:
         raise PermissionError("User account is not active")
 
-    return AuthContext(user_id=result["user_id"], scope=result["scope"])
+    auth = AuthContext(user_id=result["user_id"], scope=result["scope"])
+    expires_at = time.monotonic() + _VALIDATION_CACHE_TTL
+    _VALIDATION_CACHE[_cache_key(raw_key)] = (expires_at, result["key_id"], auth)
+    if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_MAX:
+        _VALIDATION_CACHE.popitem(last=False)
+    return auth
@@ -10,14 +10,15 @@ _PROJECT_ROOT = Path(__file__).parent.parent
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
-from dotenv import load_dotenv
+from sqlite_settings import configure_connection
+from config import ensure_dotenv_loaded
 
-# Load .env from the project root
-load_dotenv(_PROJECT_ROOT / ".env")
+# Load .env from the project root (no-op if config.py already did)
+ensure_dotenv_loaded()
 
 
 def open_db() -> sqlite3.Connection:
-    """Open a sqlite3 connection with WAL mode and foreign keys enabled.
+    """Open a sqlite3 connection with foreign keys and read tuning enabled.
 
     Returns:
         sqlite3.Connection ready for use.
@@ -31,8 +32,13 @@ def open_db() -> sqlite3.Connection:
         conn = sqlite3.connect(db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        return conn
+        # Same tuning as the web app's connections; WAL itself is set by init_db()
+        return configure_connection(conn)
     except Exception as exc:
         print(f"[mcp_server] Failed to open database at {db_path}: {exc}", file=sys.stderr)
         sys.exit(2)
+
+
+def optimize_db(conn: sqlite3.Connection) -> None:
+    """Run PRAGMA optimize to refresh query planner statistics where needed."""
+    conn.execute("PRAGMA optimize")
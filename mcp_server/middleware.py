@@ -1,9 +1,27 @@
 """ASGI middleware for per-request API key authentication (HTTP transport)."""
 
-import json
 import sqlite3
+import time
 
-from mcp_server.auth import resolve_auth, set_current_auth
+import orjson
+
+from mcp_server.auth import (
+    cached_auth,
+    reset_current_auth,
+    resolve_auth,
+    set_current_auth,
+)
+
+_DEFAULT_401_DESCRIPTION = "Missing or invalid API key"
+_MAX_401_CACHE = 16
+_WWW_AUTHENTICATE = b'Bearer realm="activity-manager"'
+
+# Failed-auth throttle: after more than _FAIL_LIMIT rejected keys from one client
+# IP within _FAIL_WINDOW seconds, keys that are not in the auth cache get 429
+# instead of a database lookup.
+_FAIL_WINDOW = 10.0  # seconds
+_FAIL_LIMIT = 20
+_FAIL_TRACK_MAX = 10_000
 
 
 class ApiKeyMiddleware:
@@ -14,58 +32,169 @@ class ApiKeyMiddleware:
       - X-API-Key: <key>
 
     On authentication failure returns a 401 with a WWW-Authenticate header.
+
+    Only rejections of a presented key count as failures; requests without a
+    key (health checks, preflights, a client's first probe) do not. Once an
+    IP has more than _FAIL_LIMIT failures in its window, keys that would need
+    a database lookup get a 429 until the window expires. Keys already in the
+    auth cache are still accepted.
+
+    The IP is scope["client"]. Behind a reverse proxy this is the real client
+    only when uvicorn trusts the proxy's X-Forwarded-For header
+    (FORWARDED_ALLOW_IPS, default 127.0.0.1). Otherwise every client shares
+    the proxy's address, and one client sending bad keys throttles everyone's
+    uncached keys for up to _FAIL_WINDOW seconds.
     """
 
     def __init__(self, app, conn: sqlite3.Connection) -> None:
         self.app = app
         self.conn = conn
+        # 401 responses only vary by a small fixed set of descriptions; build each once.
+        self._401_cache: dict[str, tuple] = {
+            _DEFAULT_401_DESCRIPTION: self._build_401(_DEFAULT_401_DESCRIPTION)
+        }
+        self._429 = self._build_429()
+        # client IP -> (failure count, window start)
+        self._fail_counts: dict[str, tuple[int, float]] = {}
 
     async def __call__(self, scope, receive, send) -> None:
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        headers = {k.lower(): v for k, v in scope.get("headers", [])}
-        auth = self._auth_from_key(headers)
-
-        if auth is None:
-            await self._send_401(send, "Missing or invalid API key")
+        # ASGI header names are already lowercased; scan once instead of building a dict
+        auth_h = xkey_h = b""
+        # "headers" is mandatory in an ASGI http scope, so index it directly
+        for k, v in scope["headers"]:
+            if k == b"authorization":
+                auth_h = v
+                if xkey_h:
+                    break
+            elif k == b"x-api-key":
+                xkey_h = v
+                if auth_h:
+                    break
+        key = self._key_from_headers(auth_h, xkey_h)
+        if key is None:
+            await self._send_401(send)
             return
 
-        set_current_auth(auth)
-        await self.app(scope, receive, send)
-
-    def _auth_from_key(self, headers: dict):
-        auth_header = headers.get(b"authorization", b"").decode()
-        api_key_header = headers.get(b"x-api-key", b"").decode()
-
-        api_key = ""
-        if auth_header.lower().startswith("bearer "):
-            api_key = auth_header[7:].strip()
-        if not api_key:
-            api_key = api_key_header.strip()
+        client = scope.get("client")
+        ip = client[0] if client else None
+        try:
+            auth = cached_auth(self.conn, key)
+            if auth is None:
+                # Uncached keys cost a hash lookup (and maybe a write)
+                if ip is not None and self._is_throttled(ip):
+                    await self._send_429(send)
+                    return
+                auth = resolve_auth(self.conn, key)
+        except PermissionError:
+            if ip is not None:
+                self._record_failure(ip)
+            await self._send_401(send)
+            return
 
-        if not api_key:
+        token = set_current_auth(auth)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_current_auth(token)
+
+    @staticmethod
+    def _key_from_headers(auth_h: bytes, xkey_h: bytes):
+        """Return the presented API key as str, or None if there is none."""
+        # Compare the scheme as bytes and decode only the key actually used
+        key = b""
+        if auth_h[:7].lower() == b"bearer ":
+            key = auth_h[7:].strip()
+        if not key:
+            key = xkey_h.strip()
+
+        if not key:
             return None
         try:
-            return resolve_auth(self.conn, api_key)
-        except PermissionError:
+            return key.decode("ascii")
+        except UnicodeDecodeError:
+            # Not a key this server could have issued; not counted as a failure
             return None
 
-    async def _send_401(self, send, error_description: str) -> None:
-        body = json.dumps(
+    def _is_throttled(self, ip: str) -> bool:
+        entry = self._fail_counts.get(ip)
+        if entry is None:
+            return False
+        count, started = entry
+        if time.monotonic() - started >= _FAIL_WINDOW:
+            del self._fail_counts[ip]
+            return False
+        return count > _FAIL_LIMIT
+
+    def _record_failure(self, ip: str) -> None:
+        now = time.monotonic()
+        entry = self._fail_counts.get(ip)
+        if entry is None or now - entry[1] >= _FAIL_WINDOW:
+            self._fail_counts[ip] = (1, now)
+        else:
+            self._fail_counts[ip] = (entry[0] + 1, entry[1])
+
+        if len(self._fail_counts) > _FAIL_TRACK_MAX:
+            # Sweep expired windows; if that is not enough, start over
+            for key in [k for k, (_, s) in self._fail_counts.items() if now - s >= _FAIL_WINDOW]:
+                del self._fail_counts[key]
+            if len(self._fail_counts) > _FAIL_TRACK_MAX:
+                self._fail_counts.clear()
+
+    @staticmethod
+    def _build_429() -> tuple:
+        body = orjson.dumps(
+            {
+                "error": "too_many_requests",
+                "error_description": "Too many failed authentication attempts",
+            }
+        )
+        headers = (
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(int(_FAIL_WINDOW)).encode()),
+        )
+        return body, headers
+
+    async def _send_429(self, send) -> None:
+        body, headers = self._429
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _build_401(error_description: str) -> tuple:
+        body = orjson.dumps(
             {"error": "invalid_token", "error_description": error_description}
-        ).encode()
+        )
+        headers = (
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"www-authenticate", _WWW_AUTHENTICATE),
+        )
+        return body, headers
+
+    async def _send_401(self, send, error_description: str = _DEFAULT_401_DESCRIPTION) -> None:
+        cached = self._401_cache.get(error_description)
+        if cached is None:
+            cached = self._build_401(error_description)
+            if len(self._401_cache) < _MAX_401_CACHE:
+                self._401_cache[error_description] = cached
+        body, headers = cached
 
         await send(
             {
                 "type": "http.response.start",
                 "status": 401,
-                "headers": [
-                    [b"content-type", b"application/json"],
-                    [b"content-length", str(len(body)).encode()],
-                    [b"www-authenticate", b'Bearer realm="activity-manager"'],
-                ],
+                "headers": headers,
             }
         )
         await send({"type": "http.response.body", "body": body})
@@ -40,9 +40,22 @@ logger = logging.getLogger(__name__)
 
 from mcp.server.fastmcp import FastMCP
 
-from mcp_server.db import open_db
+from mcp_server.db import open_db, optimize_db
 from mcp_server.auth import resolve_auth, set_current_auth
 from mcp_server.tools import register_all_tools
+from mcp_server.tools.types import warm_types_cache
+
+
+def _warmup(conn) -> None:
+    """Refresh planner statistics and preload rarely-changing lookups."""
+    optimize_db(conn)
+    warm_types_cache(conn)
+
+
+def _shutdown(conn) -> None:
+    """Refresh planner statistics once more and close the connection."""
+    optimize_db(conn)
+    conn.close()
 
 
 def main() -> None:
@@ -79,8 +92,12 @@ def main() -> None:
 
         @asynccontextmanager
         async def lifespan(app):
-            async with session_manager.run():
-                yield
+            _warmup(conn)
+            try:
+                async with session_manager.run():
+                    yield
+            finally:
+                _shutdown(conn)
 
         def _normalize_path(inner):
             async def wrapped(scope, receive, send):
@@ -117,7 +134,11 @@ def main() -> None:
             sys.exit(1)
 
         set_current_auth(auth)
-        mcp.run(transport="stdio")
+        _warmup(conn)
+        try:
+            mcp.run(transport="stdio")
+        finally:
+            _shutdown(conn)
 
 
 if __name__ == "__main__":
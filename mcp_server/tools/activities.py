@@ -1,13 +1,20 @@
 """Activity tools for the MCP server."""
 
-import json
 import sqlite3
 from typing import Optional
 
+import orjson
+
 from app.repositories.activity_repository import ActivityRepository
+from app.utils.errors import ActivityNotFoundError
 from mcp_server.auth import get_current_auth
 
 
+def _validate_pain(field: str, value: int) -> None:
+    if not (0 <= value <= 10):
+        raise ValueError(f"{field} must be between 0 and 10, got {value}")
+
+
 def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
     """Register activity read and write tools."""
 
@@ -62,13 +69,14 @@ def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
         if extended_type_id is not None:
             filters["extended_type_id"] = extended_type_id
 
-        rows = repo.get_activities(
+        # Serialized row by row in the repository; no intermediate list of dicts
+        body = repo.get_activities_json(
             filters=filters,
             limit=min(limit, 200),
             offset=offset,
             user_id=auth.user_id,
         )
-        return json.dumps([dict(r) for r in rows])
+        return body.decode()
 
     @mcp.tool()
     def search_activities(query: str, limit: int = 20) -> str:
@@ -82,14 +90,8 @@ def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
             JSON array of matching activity dictionaries.
         """
         auth = get_current_auth()
-        q = query.lower()
-        all_activities = repo.get_activities(user_id=auth.user_id, limit=1000)
-        matches = [
-            dict(a) for a in all_activities
-            if q in (a.get("name") or "").lower()
-            or q in (a.get("description") or "").lower()
-        ]
-        return json.dumps(matches[:limit])
+        matches = repo.search_activities(query, limit=limit, user_id=auth.user_id)
+        return orjson.dumps(matches).decode()
 
     @mcp.tool()
     def get_activity_stats(
@@ -117,21 +119,14 @@ def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
         if end_date:
             filters["end_date"] = end_date
 
-        activities = repo.get_activities(
-            filters=filters, limit=10000, user_id=auth.user_id
-        )
-
-        total = len(activities)
-        total_dist = sum((a.get("distance") or 0) for a in activities)
-        total_elev = sum((a.get("total_elevation_gain") or 0) for a in activities)
-        total_time = sum((a.get("moving_time") or 0) for a in activities)
+        stats = repo.get_stats(filters=filters, user_id=auth.user_id)
 
         return {
-            "total_count": total,
-            "total_distance_km": round(total_dist / 1000, 2),
-            "total_elevation_m": round(total_elev, 1),
-            "total_time_hours": round(total_time / 3600, 2),
-            "avg_distance_km": round(total_dist / 1000 / total, 2) if total else 0,
+            "total_count": stats["total_activities"],
+            "total_distance_km": stats["total_distance_km"],
+            "total_elevation_m": round(stats["total_elevation_meters"], 1),
+            "total_time_hours": stats["total_time_hours"],
+            "avg_distance_km": stats["average_distance_km"],
         }
 
     # ---- Write tools (readwrite scope only) ----
@@ -165,23 +160,16 @@ def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
             Updated activity dictionary.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
 
-        # Validate ownership
-        try:
-            repo.get_activity(activity_id, user_id=auth.user_id)
-        except Exception:
-            raise ValueError(f"Activity {activity_id} not found or access denied")
-
         # Validate pain values
-        for field, val in [
-            ("feeling_before_pain", feeling_before_pain),
-            ("feeling_during_pain", feeling_during_pain),
-            ("feeling_after_pain", feeling_after_pain),
-        ]:
-            if val is not None and not (0 <= val <= 10):
-                raise ValueError(f"{field} must be between 0 and 10, got {val}")
+        if feeling_before_pain is not None:
+            _validate_pain("feeling_before_pain", feeling_before_pain)
+        if feeling_during_pain is not None:
+            _validate_pain("feeling_during_pain", feeling_during_pain)
+        if feeling_after_pain is not None:
+            _validate_pain("feeling_after_pain", feeling_after_pain)
 
         data = {}
         if feeling_before_text is not None:
@@ -201,5 +189,9 @@ def register_activity_tools(mcp, conn: sqlite3.Connection) -> None:
         if extended_type_id is not None:
             data["extended_type_id"] = extended_type_id
 
-        updated = repo.update_activity(activity_id, data)
+        # Ownership is checked by the UPDATE itself (WHERE id = ? AND user_id = ?)
+        try:
+            updated = repo.update_activity(activity_id, data, user_id=auth.user_id)
+        except ActivityNotFoundError:
+            raise ValueError(f"Activity {activity_id} not found or access denied")
         return dict(updated)
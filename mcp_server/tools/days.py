@@ -1,9 +1,10 @@
 """Day journal tools for the MCP server."""
 
-import json
 import sqlite3
 from typing import Optional
 
+import orjson
+
 from app.repositories.day_repository import DayRepository
 from mcp_server.auth import get_current_auth
 
@@ -40,7 +41,7 @@ def register_day_tools(mcp, conn: sqlite3.Connection) -> None:
         """
         auth = get_current_auth()
         rows = repo.get_days_in_range(start_date, end_date, user_id=auth.user_id)
-        return json.dumps([dict(r) for r in rows])
+        return orjson.dumps(rows).decode()
 
     @mcp.tool()
     def get_day_with_activities(date: str) -> dict:
@@ -80,7 +81,7 @@ def register_day_tools(mcp, conn: sqlite3.Connection) -> None:
             Updated day dictionary.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
 
         if feeling_pain is not None and not (0 <= feeling_pain <= 10):
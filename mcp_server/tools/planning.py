@@ -1,9 +1,10 @@
 """Planned activity tools for the MCP server."""
 
-import json
 import sqlite3
 from typing import Optional
 
+import orjson
+
 from app.repositories.planned_activity_repository import PlannedActivityRepository
 from mcp_server.auth import get_current_auth
 
@@ -25,7 +26,7 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
         """
         auth = get_current_auth()
         rows = repo.get_by_day(date, auth.user_id)
-        return json.dumps([dict(r) for r in rows])
+        return orjson.dumps(rows).decode()
 
     @mcp.tool()
     def get_planned_week(start_date: str, end_date: str) -> str:
@@ -40,7 +41,7 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
         """
         auth = get_current_auth()
         rows = repo.get_by_week(start_date, end_date, auth.user_id)
-        return json.dumps([dict(r) for r in rows])
+        return orjson.dumps(rows).decode()
 
     # ---- Write tools (readwrite scope only) ----
 
@@ -67,7 +68,7 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
             The newly created planned activity dictionary.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
 
         data = {"user_id": auth.user_id, "day_date": day_date}
@@ -85,11 +86,8 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
         new_id = repo.create(data)
 
         # Return the newly created row
-        day_plans = repo.get_by_day(day_date, auth.user_id)
-        for plan in day_plans:
-            if plan["id"] == new_id:
-                return dict(plan)
-        return {"id": new_id}
+        plan = repo.get_plan(new_id, auth.user_id)
+        return plan if plan else {"id": new_id}
 
     @mcp.tool()
     def update_planned_activity(
@@ -116,7 +114,7 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
             Updated planned activity as a dict with a 'rowcount' key.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
 
         data = {}
@@ -150,7 +148,7 @@ def register_planning_tools(mcp, conn: sqlite3.Connection) -> None:
             Dict with {deleted: True, plan_id: <id>}.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
 
         rowcount = repo.delete(plan_id, auth.user_id)
@@ -1,9 +1,10 @@
 """Training template tools for the MCP server."""
 
-import json
 import sqlite3
 from typing import Optional
 
+import orjson
+
 from app.repositories.training_template_repository import TrainingTemplateRepository
 from app.repositories.planned_activity_repository import PlannedActivityRepository
 from app.utils.errors import AppError
@@ -27,7 +28,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
         """
         auth = get_current_auth()
         rows = repo.get_templates(auth.user_id, sport_type=sport_type)
-        return json.dumps([dict(r) for r in rows])
+        return orjson.dumps(rows).decode()
 
     @mcp.tool()
     def get_training_template(template_id: int) -> dict:
@@ -60,7 +61,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
             Newly created template dict.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
         return dict(repo.create_template(
             {'name': name, 'sport_type': sport_type, 'description': description},
@@ -90,7 +91,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
             Newly created segment dict.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
         return dict(repo.create_segment(template_id, auth.user_id, {
             'label': label,
@@ -125,7 +126,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
             Updated segment dict.
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
         data = {}
         if label is not None:
@@ -152,7 +153,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
             {deleted: True, segment_id: <id>}
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
         repo.delete_segment(segment_id, template_id, auth.user_id)
         return {'deleted': True, 'segment_id': segment_id}
@@ -169,7 +170,7 @@ def register_template_tools(mcp, conn: sqlite3.Connection) -> None:
             {plan_id: <id>, updated: True}
         """
         auth = get_current_auth()
-        if not auth.can_write():
+        if not auth.can_write:
             raise PermissionError("readwrite scope required")
         plan_repo = PlannedActivityRepository(db=conn)
         rowcount = plan_repo.update(plan_id, auth.user_id, {'template_id': template_id})
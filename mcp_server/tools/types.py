@@ -1,18 +1,55 @@
 """Activity type and gear tools for the MCP server (always read-only)."""
 
-import json
 import sqlite3
+import time
+from functools import partial
 from typing import Optional
 
+import orjson
+
 from app.repositories.type_repository import TypeRepository
 from app.repositories.gear_repository import GearRepository
 
+# Type tables rarely change (and are edited from the web app, a separate
+# process), so results are reused for a short TTL instead of being evicted
+# on write.
+_TYPES_CACHE_TTL = 60.0  # seconds
+_types_cache: dict[str, tuple[float, object]] = {}
+
+
+def _cached(name: str, loader):
+    now = time.monotonic()
+    hit = _types_cache.get(name)
+    if hit is not None and now - hit[0] < _TYPES_CACHE_TTL:
+        return hit[1]
+    value = loader()
+    _types_cache[name] = (now, value)
+    return value
+
+
+def _load_standard(conn: sqlite3.Connection) -> str:
+    rows = TypeRepository(db=conn).get_standard_types()
+    return orjson.dumps(rows).decode()
+
+
+def _load_extended(conn: sqlite3.Connection) -> tuple:
+    rows = TypeRepository(db=conn).get_extended_types()
+    return rows, orjson.dumps(rows).decode()
+
+
+def warm_types_cache(conn: sqlite3.Connection) -> None:
+    """Load the standard/extended type listings into the cache ahead of the first call."""
+    now = time.monotonic()
+    _types_cache["standard"] = (now, _load_standard(conn))
+    _types_cache["extended"] = (now, _load_extended(conn))
+
 
 def register_type_tools(mcp, conn: sqlite3.Connection) -> None:
     """Register type and gear read-only tools."""
 
-    type_repo = TypeRepository(db=conn)
     gear_repo = GearRepository(db=conn)
+    load_standard = partial(_load_standard, conn)
+    load_extended = partial(_load_extended, conn)
 
     @mcp.tool()
     def list_standard_types() -> str:
@@ -21,8 +58,7 @@ def register_type_tools(mcp, conn: sqlite3.Connection) -> None:
         Returns:
             JSON array of standard type dicts with name, category, display_name, icon, color.
         """
-        rows = type_repo.get_standard_types()
-        return json.dumps([dict(r) for r in rows])
+        return _cached("standard", load_standard)
 
     @mcp.tool()
     def list_extended_types(base_sport_type: Optional[str] = None) -> str:
@@ -34,10 +70,11 @@ def register_type_tools(mcp, conn: sqlite3.Connection) -> None:
         Returns:
             JSON array of extended type dicts with id, base_sport_type, custom_name, color_class.
         """
-        rows = type_repo.get_extended_types()
-        if base_sport_type:
-            rows = [r for r in rows if r.get("base_sport_type") == base_sport_type]
-        return json.dumps([dict(r) for r in rows])
+        rows, body = _cached("extended", load_extended)
+        if not base_sport_type:
+            return body
+        rows = [r for r in rows if r.get("base_sport_type") == base_sport_type]
+        return orjson.dumps(rows).decode()
 
     @mcp.tool()
     def list_gear() -> str:
@@ -46,16 +83,6 @@ def register_type_tools(mcp, conn: sqlite3.Connection) -> None:
         Returns:
             JSON array of gear dicts including stats (total_activities, total_distance_km, etc.).
         """
+        # Stats, including total_distance_km, are aggregated in SQL by the repository
         gear_list = gear_repo.get_all_gear_with_stats()
-        result = []
-        for g in gear_list:
-            item = dict(g)
-            # Convert distance stats to km for readability
-            if "stats" in item and item["stats"]:
-                stats = dict(item["stats"])
-                stats["total_distance_km"] = round(
-                    (stats.get("total_distance") or 0) / 1000, 2
-                )
-                item["stats"] = stats
-            result.append(item)
-        return json.dumps(result)
+        return orjson.dumps(gear_list).decode()
@@ -4,8 +4,11 @@ Activity Manager - Flask Application Entry Point
 
 Usage:
     python run.py
+
+Without debug mode, serves through waitress (WAITRESS_THREADS threads, default 8).
 """
 import os
+from flask.helpers import get_debug_flag
 from app import create_app
 
 # Create Flask application instance
@@ -16,5 +19,25 @@ if __name__ == '__main__':
     host = os.environ.get('FLASK_HOST', '0.0.0.0')
     port = int(os.environ.get('FLASK_PORT', 5001))
 
+    # Debug (and the reloader) follows the FLASK_ENV config unless FLASK_DEBUG
+    # overrides it; never assume it when the config doesn't set DEBUG
+    debug = app.config.get('DEBUG', False)
+    if 'FLASK_DEBUG' in os.environ:
+        debug = get_debug_flag()
+
+    # Outside debug mode serve through waitress (deployments use gunicorn wsgi:app)
+    serve = None
+    if not debug:
+        try:
+            from waitress import serve
+        except ImportError:
+            app.logger.warning(
+                'waitress is not installed; falling back to the Flask development server '
+                '(pip install -r requirements.txt)'
+            )
+
     # Run the application
-    app.run(host=host, port=port, debug=app.config.get('DEBUG', True))
+    if serve is not None:
+        serve(app, host=host, port=port, threads=int(os.environ.get('WAITRESS_THREADS', '8')))
+    else:
+        app.run(host=host, port=port, debug=debug, use_reloader=debug, threaded=True)
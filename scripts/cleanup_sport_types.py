@@ -9,6 +9,7 @@ verbatim, which causes them to appear in UI dropdowns.
 
 What this script does:
   1. Finds all standard_activity_types rows whose name matches root='...'
+     (case-sensitive)
   2. Extracts the clean name (e.g. root='Run' -> Run)
   3. Updates any activities/planned_activities rows that reference the raw name
      to use the clean name instead
@@ -24,123 +25,190 @@ If database_path is omitted, reads DATABASE_PATH from .env or defaults to
 activities.db in the project root.
 """
 
-import sqlite3
 import sys
 import os
-import re
-import shutil
 from datetime import datetime
 
+from migration_db import connect, copy_database
+
 
 def backup_database(db_path):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.pre_cleanup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
+    copy_database(db_path, backup_path)
     print(f"✓ Backup created: {backup_path}")
     return backup_path
 
 
 def parse_root_name(raw):
     """Extract clean name from root='XYZ' format, or return None if not that format."""
-    m = re.match(r"^root='(.+)'$", raw)
-    return m.group(1) if m else None
+    if raw.startswith("root='") and raw.endswith("'") and len(raw) > 7 and '\n' not in raw:
+        return raw[6:-1]
+    return None
+
+
+def has_sport_type_index(cursor, table):
+    """True if some index on table starts with the sport_type column."""
+    cursor.execute(
+        """SELECT 1 FROM pragma_index_list(?) il
+           JOIN pragma_index_info(il.name) ii
+           WHERE ii.seqno = 0 AND ii.name = 'sport_type'""",
+        (table,)
+    )
+    return cursor.fetchone() is not None
 
 
 def cleanup_sport_types(conn):
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    # Find all root='...' entries
+    # Find all root='...' entries. GLOB is case-sensitive, so SQLite can
+    # answer the prefix match with a range search on the name primary key
+    # (LIKE is case-insensitive and has to scan the table).
     cursor.execute(
-        "SELECT name FROM standard_activity_types WHERE name LIKE \"root='%'\""
+        "SELECT name FROM standard_activity_types WHERE name GLOB 'root=''*'''"
     )
-    bad_rows = cursor.fetchall()
+    bad_names = [row[0] for row in cursor.fetchall()]
 
-    if not bad_rows:
+    if not bad_names:
         print("✓ No root='...' entries found — nothing to clean up.")
         return
 
-    print(f"Found {len(bad_rows)} root='...' entries to clean up:\n")
+    print(f"Found {len(bad_names)} root='...' entries to clean up:\n")
 
-    for row in bad_rows:
-        raw_name = row['name']
+    pairs = []
+    for raw_name in bad_names:
         clean_name = parse_root_name(raw_name)
 
         if not clean_name:
             print(f"  SKIP  {raw_name!r} — could not parse clean name")
             continue
 
-        # Check if the clean name already exists in standard_activity_types
+        pairs.append((raw_name, clean_name))
+
+    # One explicit write transaction for everything below; the temp table
+    # and index DDL would otherwise run outside it and commit on their own
+    cursor.execute('BEGIN IMMEDIATE')
+
+    # Stage the raw -> clean mapping so each fix below is one set-based
+    # statement instead of three or four statements per entry
+    cursor.execute('DROP TABLE IF EXISTS temp._cleanup')
+    cursor.execute(
+        """CREATE TEMP TABLE _cleanup (
+               raw TEXT PRIMARY KEY,
+               clean TEXT NOT NULL,
+               remap INTEGER NOT NULL DEFAULT 0
+           )"""
+    )
+    cursor.executemany('INSERT INTO _cleanup (raw, clean) VALUES (?, ?)', pairs)
+
+    # Entries whose clean name already exists are remapped onto it and
+    # deleted; the others are renamed in place
+    cursor.execute(
+        """UPDATE _cleanup SET remap = EXISTS (
+               SELECT 1 FROM standard_activity_types s WHERE s.name = _cleanup.clean
+           )"""
+    )
+
+    # The counts and remaps below look rows up by sport_type; add a temporary
+    # index to tables that lack one (planned_activities has none) so they
+    # aren't scanned
+    temp_indexes = []
+    for table in ('activities', 'planned_activities'):
+        if not has_sport_type_index(cursor, table):
+            index_name = f'tmp_{table}_sport_type'
+            cursor.execute(f'CREATE INDEX {index_name} ON {table}(sport_type)')
+            temp_indexes.append(index_name)
+
+    # Give the planner statistics on sport_type so the lookups below search
+    # the index; analysis_limit keeps ANALYZE to a sample on large tables.
+    # Note which tables already had statistics so only ours are removed again.
+    analyzed_tables = ('activities', 'planned_activities', 'standard_activity_types')
+    had_stat_table = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone() is not None
+    had_stats = set()
+    if had_stat_table:
+        had_stats = {row[0] for row in cursor.execute('SELECT DISTINCT tbl FROM sqlite_stat1')}
+    cursor.execute('PRAGMA analysis_limit = 1000')
+    for table in analyzed_tables:
+        cursor.execute(f'ANALYZE {table}')
+
+    # Per-entry counts for the report, taken before the remap
+    acts_updated = dict(cursor.execute(
+        """SELECT sport_type, COUNT(*) FROM activities
+           WHERE sport_type IN (SELECT raw FROM _cleanup) GROUP BY sport_type"""
+    ).fetchall())
+    plans_updated = dict(cursor.execute(
+        """SELECT sport_type, COUNT(*) FROM planned_activities
+           WHERE sport_type IN (SELECT raw FROM _cleanup) GROUP BY sport_type"""
+    ).fetchall())
+
+    remapped = {row[0] for row in cursor.execute('SELECT raw FROM _cleanup WHERE remap')}
+
+    # Remap activities and planned activities to the clean names
+    for table in ('activities', 'planned_activities'):
         cursor.execute(
-            "SELECT name FROM standard_activity_types WHERE name = ?", (clean_name,)
+            f"""UPDATE {table}
+                SET sport_type = (SELECT clean FROM _cleanup WHERE raw = {table}.sport_type)
+                WHERE sport_type IN (SELECT raw FROM _cleanup)"""
         )
-        target_exists = cursor.fetchone() is not None
-
-        if target_exists:
-            # Remap activities to the existing clean entry, then delete the bad row
-            cursor.execute(
-                "UPDATE activities SET sport_type = ? WHERE sport_type = ?",
-                (clean_name, raw_name)
-            )
-            acts_updated = cursor.rowcount
-
-            cursor.execute(
-                "UPDATE planned_activities SET sport_type = ? WHERE sport_type = ?",
-                (clean_name, raw_name)
-            )
-            plans_updated = cursor.rowcount
-
-            cursor.execute(
-                "DELETE FROM standard_activity_types WHERE name = ?", (raw_name,)
-            )
-            print(
-                f"  FIXED  {raw_name!r} → {clean_name!r}  "
-                f"(activities: {acts_updated}, planned: {plans_updated})"
-            )
-
-        else:
-            # Clean name doesn't exist — rename the row in-place.
-            # SQLite has no RENAME COLUMN for the PK, so we update the name
-            # and display_name and mark it official if it looks like a known type.
-            cursor.execute(
-                """UPDATE standard_activity_types
-                   SET name = ?, display_name = ?, is_official = 0
-                   WHERE name = ?""",
-                (clean_name, clean_name, raw_name)
-            )
-            # Remap any activities that referenced the old raw name
-            cursor.execute(
-                "UPDATE activities SET sport_type = ? WHERE sport_type = ?",
-                (clean_name, raw_name)
-            )
-            acts_updated = cursor.rowcount
-
-            cursor.execute(
-                "UPDATE planned_activities SET sport_type = ? WHERE sport_type = ?",
-                (clean_name, raw_name)
-            )
-            plans_updated = cursor.rowcount
-
-            print(
-                f"  RENAMED  {raw_name!r} → {clean_name!r}  "
-                f"(activities: {acts_updated}, planned: {plans_updated})"
-            )
-
-    conn.commit()
+
+    cursor.execute(
+        """DELETE FROM standard_activity_types
+           WHERE name IN (SELECT raw FROM _cleanup WHERE remap)"""
+    )
+
+    # Clean name doesn't exist — rename the remaining rows in-place.
+    # SQLite has no RENAME COLUMN for the PK, so we update the name
+    # and display_name and mark them unofficial.
+    cursor.execute(
+        """UPDATE standard_activity_types
+           SET name = (SELECT clean FROM _cleanup WHERE raw = standard_activity_types.name),
+               display_name = (SELECT clean FROM _cleanup WHERE raw = standard_activity_types.name),
+               is_official = 0
+           WHERE name IN (SELECT raw FROM _cleanup WHERE NOT remap)"""
+    )
+
+    cursor.execute('DROP TABLE temp._cleanup')
+    for index_name in temp_indexes:
+        cursor.execute(f'DROP INDEX {index_name}')
+
+    # ANALYZE persists its results in sqlite_stat1; don't leave statistics
+    # behind for tables that had none, they would steer the app's planner
+    if not had_stat_table:
+        cursor.execute('DROP TABLE sqlite_stat1')
+    else:
+        for table in analyzed_tables:
+            if table not in had_stats:
+                cursor.execute('DELETE FROM sqlite_stat1 WHERE tbl = ?', (table,))
+
+    for raw_name, clean_name in pairs:
+        action = 'FIXED' if raw_name in remapped else 'RENAMED'
+        print(
+            f"  {action}  {raw_name!r} → {clean_name!r}  "
+            f"(activities: {acts_updated.get(raw_name, 0)}, "
+            f"planned: {plans_updated.get(raw_name, 0)})"
+        )
+
     print("\n✓ Cleanup complete.")
 
 
 def resolve_db_path(arg=None):
     if arg:
         return arg
+    # An exported DATABASE_PATH wins; no need to read .env at all
+    if os.environ.get('DATABASE_PATH'):
+        return os.environ['DATABASE_PATH']
     # Try to read from .env
     env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if os.path.exists(env_path):
+    try:
         with open(env_path) as f:
             for line in f:
                 line = line.strip()
                 if line.startswith('DATABASE_PATH='):
                     return line.split('=', 1)[1].strip().strip('"\'')
+    except FileNotFoundError:
+        pass
     # Default
     return os.path.join(os.path.dirname(__file__), '..', 'activities.db')
 
@@ -157,13 +225,22 @@ if __name__ == '__main__':
 
     backup_database(db_path)
 
-    conn = sqlite3.connect(db_path)
+    # Same session tuning as the migration scripts (NORMAL sync,
+    # in-memory temp store for the _cleanup table, large page cache).
+    # WAL makes the commit cheap; the database's own journal mode is put
+    # back afterwards for apps that expect a rollback journal.
+    conn = connect(db_path)
+    journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
     try:
-        cleanup_sport_types(conn)
+        conn.execute('PRAGMA journal_mode = WAL')
+        # Commits the cleanup transaction on success, rolls it back on error
+        with conn:
+            cleanup_sport_types(conn)
     except Exception as e:
-        conn.rollback()
         print(f"\n✗ Error: {e}")
         print("Changes rolled back. The backup is safe.")
         sys.exit(1)
     finally:
+        if journal_mode.lower() != 'wal':
+            conn.execute(f'PRAGMA journal_mode = {journal_mode}')
         conn.close()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compile .env into a Python module
+
+Serializes the project's .env file into env_cache.py as a plain dict literal
+(ENV = {...}). When present, config.py loads values from this module instead
+of parsing .env text on every process start; the compiled bytecode is cached
+in __pycache__.
+
+env_cache.py holds every secret from .env and is written with mode 0600.
+Python gives __pycache__/env_cache.*.pyc the same mode; it holds the same
+secrets.
+
+Re-run this script whenever .env changes. Until then config.py sees that .env
+is newer than the cache and parses .env instead.
+
+Usage:
+    python scripts/compile_env.py [env_path] [output_path]
+"""
+
+import os
+import sys
+from dotenv import dotenv_values
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def compile_env(env_path, output_path):
+    """Write the key/value pairs from env_path to output_path as ENV = {...}"""
+    values = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+
+    lines = [
+        '# Generated by scripts/compile_env.py from .env -- do not edit.',
+        '# Contains secrets: keep out of version control.',
+        'ENV = {',
+    ]
+    for key in sorted(values):
+        lines.append(f'    {key!r}: {values[key]!r},')
+    lines.append('}')
+
+    # Owner-only, like .env itself; chmod covers a cache left by an older run
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(output_path, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return len(values)
+
+
+def main():
+    env_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(PROJECT_ROOT, '.env')
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(PROJECT_ROOT, 'env_cache.py')
+
+    if not os.path.exists(env_path):
+        print(f"❌ .env not found: {env_path}")
+        sys.exit(1)
+
+    count = compile_env(env_path, output_path)
+    print(f"✓ Compiled {count} variables from {env_path} into {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,12 +12,9 @@ import json
 import os
 import shutil
 import sqlite3
-import sys
 from datetime import datetime
 
-# Add project root to path so we can import app modules
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, PROJECT_ROOT)
 
 
 # ---------- Configuration ----------
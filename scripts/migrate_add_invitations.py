@@ -8,18 +8,18 @@ Usage:
     python scripts/migrate_add_invitations.py [database_path]
 """
 
-import sqlite3
 import sys
 import os
-import shutil
 from datetime import datetime
 
+from migration_db import connect, copy_database
+
 
 def backup_database(db_path):
     """Create a timestamped backup of the database"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.pre_invitations_backup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
+    copy_database(db_path, backup_path)
     print(f"✓ Database backed up to: {backup_path}")
     return backup_path
 
@@ -36,6 +36,8 @@ def migrate_add_invitations(conn):
         print("✓ invitations table already exists, skipping")
         return
 
+    # Table and indexes are created together or not at all
+    conn.execute('BEGIN IMMEDIATE')
     conn.execute('''
         CREATE TABLE invitations (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -80,9 +82,14 @@ def main():
 
     # Connect and migrate
     try:
-        conn = sqlite3.connect(db_path)
-        migrate_add_invitations(conn)
-        conn.close()
+        conn = connect(db_path)
+        try:
+            migrate_add_invitations(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
         print("\n✅ Migration completed successfully!")
         print(f"📁 Backup saved: {backup_path}")
@@ -9,18 +9,18 @@ Usage:
     python scripts/migrate_coach_invitations.py [database_path]
 """
 
-import sqlite3
 import sys
 import os
-import shutil
 from datetime import datetime
 
+from migration_db import connect, copy_database
+
 
 def backup_database(db_path):
     """Create a timestamped backup of the database"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.pre_coach_invite_backup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
+    copy_database(db_path, backup_path)
     print(f"✓ Database backed up to: {backup_path}")
     return backup_path
 
@@ -37,6 +37,10 @@ def migrate_coach_invitations(conn):
         print("✓ Migration already completed")
         return
 
+    # Explicit transaction: the DDL below would otherwise autocommit step by
+    # step, leaving a renamed table behind if a later step fails
+    conn.execute('BEGIN IMMEDIATE')
+
     # Step 1: Rename old table
     conn.execute('ALTER TABLE coach_athlete_relationships RENAME TO coach_athlete_relationships_old')
 
@@ -99,9 +103,14 @@ def main():
 
     # Connect and migrate
     try:
-        conn = sqlite3.connect(db_path)
-        migrate_coach_invitations(conn)
-        conn.close()
+        conn = connect(db_path)
+        try:
+            migrate_coach_invitations(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
         print("\n✅ Migration completed successfully!")
         print(f"📁 Backup saved: {backup_path}")
@@ -6,26 +6,31 @@ Migrates the single-user Activity Manager database to support multiple users,
 coach-athlete relationships, and per-user Strava connections.
 
 Usage:
-    python scripts/migrate_to_multiuser.py [database_path]
+    python scripts/migrate_to_multiuser.py [--yes] [--quiet] [database_path]
 
 If database_path is not provided, uses activities.db in the current directory.
+--yes (or MIGRATE_ASSUME_YES=1) skips the confirmation prompt for scripted
+deploys; the admin credentials are still read from stdin. --quiet hides the
+per-step progress log and only prints prompts, the summary and errors.
 """
 
-import sqlite3
 import sys
 import os
-import shutil
+import logging
 from datetime import datetime
 from getpass import getpass
-import bcrypt
+
+from migration_db import connect, copy_database
+
+logger = logging.getLogger('migrate')
 
 
 def backup_database(db_path):
     """Create a timestamped backup of the database"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.pre_multiuser_backup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
-    print(f"✓ Database backed up to: {backup_path}")
+    copy_database(db_path, backup_path)
+    logger.info("✓ Database backed up to: %s", backup_path)
     return backup_path
 
 
@@ -59,13 +64,15 @@ def get_admin_credentials():
 
 def hash_password(password):
     """Hash password using bcrypt"""
+    import bcrypt
+
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
 def create_users_table(conn):
     """Create the users table"""
-    print("\n📋 Creating users table...")
+    logger.info("\n📋 Creating users table...")
     conn.execute('''
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -80,12 +87,12 @@ def create_users_table(conn):
     ''')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)')
-    print("✓ Users table created")
+    logger.info("✓ Users table created")
 
 
 def create_coach_athlete_table(conn):
     """Create the coach-athlete relationships table"""
-    print("\n📋 Creating coach_athlete_relationships table...")
+    logger.info("\n📋 Creating coach_athlete_relationships table...")
     conn.execute('''
         CREATE TABLE IF NOT EXISTS coach_athlete_relationships (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -101,17 +108,17 @@ def create_coach_athlete_table(conn):
     ''')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_relationships_coach ON coach_athlete_relationships(coach_id)')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_relationships_athlete ON coach_athlete_relationships(athlete_id)')
-    print("✓ Coach-athlete relationships table created")
+    logger.info("✓ Coach-athlete relationships table created")
 
 
 def migrate_strava_tokens_table(conn, admin_user_id):
     """Migrate strava_tokens to multi-user version"""
-    print("\n📋 Migrating strava_tokens table...")
+    logger.info("\n📋 Migrating strava_tokens table...")
 
     # Check if old table exists
     cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='strava_tokens'")
     if not cursor.fetchone():
-        print("✓ No existing strava_tokens table - creating new one")
+        logger.info("✓ No existing strava_tokens table - creating new one")
         create_new_strava_tokens_table(conn)
         return
 
@@ -121,7 +128,7 @@ def migrate_strava_tokens_table(conn, admin_user_id):
 
     # Rename old table
     conn.execute('ALTER TABLE strava_tokens RENAME TO strava_tokens_old')
-    print("  - Renamed old table to strava_tokens_old")
+    logger.info("  - Renamed old table to strava_tokens_old")
 
     # Create new table
     create_new_strava_tokens_table(conn)
@@ -141,9 +148,9 @@ def migrate_strava_tokens_table(conn, admin_user_id):
             old_token[6],  # created_at
             old_token[7]   # updated_at
         ))
-        print(f"  - Migrated existing Strava token to admin user (athlete: {old_token[2]})")
+        logger.info("  - Migrated existing Strava token to admin user (athlete: %s)", old_token[2])
 
-    print("✓ Strava tokens table migrated")
+    logger.info("✓ Strava tokens table migrated")
 
 
 def create_new_strava_tokens_table(conn):
@@ -168,60 +175,60 @@ def create_new_strava_tokens_table(conn):
 
 def add_user_id_to_activities(conn, admin_user_id):
     """Add user_id column to activities table"""
-    print("\n📋 Adding user_id to activities table...")
+    logger.info("\n📋 Adding user_id to activities table...")
 
     # Check if column already exists
     cursor = conn.execute("PRAGMA table_info(activities)")
     columns = [row[1] for row in cursor.fetchall()]
 
     if 'user_id' in columns:
-        print("  - user_id column already exists")
+        logger.info("  - user_id column already exists")
     else:
         conn.execute('ALTER TABLE activities ADD COLUMN user_id INTEGER REFERENCES users(id) ON DELETE CASCADE')
-        print("  - Added user_id column")
+        logger.info("  - Added user_id column")
 
     # Update all existing activities to belong to admin
     result = conn.execute('UPDATE activities SET user_id = ? WHERE user_id IS NULL', (admin_user_id,))
     count = result.rowcount
-    print(f"  - Assigned {count} activities to admin user")
+    logger.info("  - Assigned %s activities to admin user", count)
 
     # Create index
     conn.execute('CREATE INDEX IF NOT EXISTS idx_activities_user_id ON activities(user_id)')
-    print("✓ Activities table updated")
+    logger.info("✓ Activities table updated")
 
 
 def add_user_id_to_days(conn, admin_user_id):
     """Add user_id column to days table"""
-    print("\n📋 Adding user_id to days table...")
+    logger.info("\n📋 Adding user_id to days table...")
 
     # Check if column already exists
     cursor = conn.execute("PRAGMA table_info(days)")
     columns = [row[1] for row in cursor.fetchall()]
 
     if 'user_id' in columns:
-        print("  - user_id column already exists")
+        logger.info("  - user_id column already exists")
     else:
         conn.execute('ALTER TABLE days ADD COLUMN user_id INTEGER REFERENCES users(id) ON DELETE CASCADE')
-        print("  - Added user_id column")
+        logger.info("  - Added user_id column")
 
     # Update all existing days to belong to admin
     result = conn.execute('UPDATE days SET user_id = ? WHERE user_id IS NULL', (admin_user_id,))
     count = result.rowcount
-    print(f"  - Assigned {count} day records to admin user")
+    logger.info("  - Assigned %s day records to admin user", count)
 
     # Create index
     conn.execute('CREATE INDEX IF NOT EXISTS idx_days_user_id ON days(user_id)')
-    print("✓ Days table updated")
+    logger.info("✓ Days table updated")
 
 
 def add_user_id_to_extended_types(conn, admin_user_id):
     """Add user_id column to extended_activity_types table"""
-    print("\n📋 Adding user_id to extended_activity_types table...")
+    logger.info("\n📋 Adding user_id to extended_activity_types table...")
 
     # Check if table exists
     cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='extended_activity_types'")
     if not cursor.fetchone():
-        print("  - Table does not exist, skipping")
+        logger.info("  - Table does not exist, skipping")
         return
 
     # Check if column already exists
@@ -229,10 +236,10 @@ def add_user_id_to_extended_types(conn, admin_user_id):
     columns = [row[1] for row in cursor.fetchall()]
 
     if 'user_id' in columns:
-        print("  - user_id column already exists")
+        logger.info("  - user_id column already exists")
     else:
         conn.execute('ALTER TABLE extended_activity_types ADD COLUMN user_id INTEGER REFERENCES users(id) ON DELETE CASCADE')
-        print("  - Added user_id column")
+        logger.info("  - Added user_id column")
 
     # Update existing types - NULL user_id means system-wide types
     # Only assign to admin if they have activities using these types
@@ -241,16 +248,16 @@ def add_user_id_to_extended_types(conn, admin_user_id):
         SET user_id = NULL
         WHERE user_id IS NULL
     ''')
-    print("  - Set existing types as system-wide (user_id = NULL)")
+    logger.info("  - Set existing types as system-wide (user_id = NULL)")
 
     # Create index
     conn.execute('CREATE INDEX IF NOT EXISTS idx_extended_types_user_id ON extended_activity_types(user_id)')
-    print("✓ Extended activity types table updated")
+    logger.info("✓ Extended activity types table updated")
 
 
 def create_admin_user(conn, name, email, password):
     """Create the admin user"""
-    print("\n👤 Creating admin user...")
+    logger.info("\n👤 Creating admin user...")
 
     password_hash = hash_password(password)
 
@@ -260,36 +267,31 @@ def create_admin_user(conn, name, email, password):
     ''', (email, password_hash, name))
 
     admin_user_id = cursor.lastrowid
-    print(f"✓ Admin user created (ID: {admin_user_id}, Email: {email})")
+    logger.info("✓ Admin user created (ID: %s, Email: %s)", admin_user_id, email)
 
     return admin_user_id
 
 
 def verify_migration(conn, admin_user_id):
     """Verify migration was successful"""
-    print("\n🔍 Verifying migration...")
-
-    # Check users table
-    cursor = conn.execute('SELECT COUNT(*) FROM users')
-    user_count = cursor.fetchone()[0]
-    print(f"  - Users: {user_count}")
+    logger.info("\n🔍 Verifying migration...")
 
-    # Check activities
-    cursor = conn.execute('SELECT COUNT(*) FROM activities WHERE user_id = ?', (admin_user_id,))
-    activity_count = cursor.fetchone()[0]
-    print(f"  - Activities assigned to admin: {activity_count}")
+    # One statement for all counts; the per-user ones are answered from the
+    # user_id indexes created above rather than by scanning the tables
+    user_count, activity_count, days_count, token_count = conn.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM users),
+            (SELECT COUNT(*) FROM activities WHERE user_id = :uid),
+            (SELECT COUNT(*) FROM days WHERE user_id = :uid),
+            (SELECT COUNT(*) FROM strava_tokens WHERE user_id = :uid)
+    ''', {'uid': admin_user_id}).fetchone()
 
-    # Check days
-    cursor = conn.execute('SELECT COUNT(*) FROM days WHERE user_id = ?', (admin_user_id,))
-    days_count = cursor.fetchone()[0]
-    print(f"  - Days assigned to admin: {days_count}")
+    logger.info("  - Users: %s", user_count)
+    logger.info("  - Activities assigned to admin: %s", activity_count)
+    logger.info("  - Days assigned to admin: %s", days_count)
+    logger.info("  - Strava tokens: %s", token_count)
 
-    # Check strava tokens
-    cursor = conn.execute('SELECT COUNT(*) FROM strava_tokens WHERE user_id = ?', (admin_user_id,))
-    token_count = cursor.fetchone()[0]
-    print(f"  - Strava tokens: {token_count}")
-
-    print("\n✓ Migration verification complete")
+    logger.info("\n✓ Migration verification complete")
 
 
 def main():
@@ -298,9 +300,16 @@ def main():
     print("Activity Manager - Multi-User Migration")
     print("=" * 60)
 
+    args = [arg for arg in sys.argv[1:] if arg not in ('--yes', '--quiet')]
+    assume_yes = '--yes' in sys.argv[1:] or os.environ.get('MIGRATE_ASSUME_YES') == '1'
+
+    # Per-step progress goes through the logger so --quiet can drop it
+    quiet = '--quiet' in sys.argv[1:]
+    logging.basicConfig(level=logging.WARNING if quiet else logging.INFO, format='%(message)s', stream=sys.stdout)
+
     # Get database path
-    if len(sys.argv) > 1:
-        db_path = sys.argv[1]
+    if args:
+        db_path = args[0]
     else:
         db_path = 'activities.db'
 
@@ -318,7 +327,10 @@ def main():
     print("  4. Create an admin user")
     print("  5. Assign all existing data to the admin user")
 
-    confirm = input("\nProceed with migration? (yes/no): ").strip().lower()
+    if assume_yes:
+        confirm = 'yes'
+    else:
+        confirm = input("\nProceed with migration? (yes/no): ").strip().lower()
     if confirm != 'yes':
         print("Migration cancelled.")
         sys.exit(0)
@@ -330,13 +342,13 @@ def main():
     admin_name, admin_email, admin_password = get_admin_credentials()
 
     # Connect to database
-    print("\n📂 Opening database...")
-    conn = sqlite3.connect(db_path)
+    logger.info("\n📂 Opening database...")
+    conn = connect(db_path)
     conn.execute('PRAGMA foreign_keys = ON')
 
     try:
-        # Begin transaction
-        conn.execute('BEGIN')
+        # Begin transaction, taking the write lock up front
+        conn.execute('BEGIN IMMEDIATE')
 
         # Create new tables
         create_users_table(conn)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared database connection for the migration scripts
+
+Opens SQLite with the session settings used for bulk schema/data updates, and
+can run the non-interactive migrations back to back on a single connection.
+
+Usage:
+    python scripts/migration_db.py [database_path]
+
+Runs migrate_coach_invitations and migrate_add_invitations in one session.
+migrate_to_multiuser.py prompts for admin credentials and is run on its own.
+"""
+
+import sqlite3
+import sys
+import os
+from datetime import datetime
+
+# Project root on sys.path for the shared connection settings (standard
+# library only; importing the app package would load Flask and .env)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlite_settings import configure_connection
+
+
+def connect(db_path):
+    """Open db_path tuned for a migration session"""
+    conn = configure_connection(sqlite3.connect(db_path))
+    # Bulk updates: a bigger page cache than the app's, and wait for the
+    # running app to release its locks instead of failing
+    conn.execute('PRAGMA cache_size = -262144')  # 256 MB
+    conn.execute('PRAGMA busy_timeout = 30000')
+    return conn
+
+
+def copy_database(db_path, backup_path):
+    """Copy db_path to backup_path with SQLite's online backup API
+
+    Unlike a plain file copy, this includes changes still in the -wal file
+    and gives a consistent snapshot even while the app is running.
+    """
+    src = sqlite3.connect(db_path)
+    try:
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst, pages=1024)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def run_all_migrations(db_path):
+    """Run the non-interactive migrations on one connection"""
+    from migrate_coach_invitations import migrate_coach_invitations
+    from migrate_add_invitations import migrate_add_invitations
+
+    # Each migration commits its own transaction; a failure rolls back only
+    # the step in progress, so completed steps are not redone on the next run
+    conn = connect(db_path)
+    try:
+        migrate_coach_invitations(conn)
+        migrate_add_invitations(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def main():
+    # Get database path
+    if len(sys.argv) > 1:
+        db_path = sys.argv[1]
+    else:
+        db_path = 'activities.db'
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+
+    print(f"📦 Migrating database: {db_path}")
+
+    # Backup database
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    backup_path = f"{db_path}.pre_migrations_backup_{timestamp}"
+    copy_database(db_path, backup_path)
+    print(f"✓ Database backed up to: {backup_path}")
+
+    try:
+        run_all_migrations(db_path)
+
+        print("\n✅ Migrations completed successfully!")
+        print(f"📁 Backup saved: {backup_path}")
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        print(f"📁 Restore from backup: {backup_path}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
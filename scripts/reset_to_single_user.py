@@ -14,15 +14,16 @@ Usage:
 import sqlite3
 import sys
 import os
-import shutil
 from datetime import datetime
 
+from migration_db import copy_database
+
 
 def backup_database(db_path):
     """Create a timestamped backup of the database"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_path = f"{db_path}.pre_reset_backup_{timestamp}"
-    shutil.copy2(db_path, backup_path)
+    copy_database(db_path, backup_path)
     print(f"✓ Database backed up to: {backup_path}")
     return backup_path
 
@@ -0,0 +1,33 @@
+"""Per-connection SQLite settings shared by the app, MCP server and scripts
+
+Standard library only, so the migration scripts can import it without
+pulling in Flask or reading .env.
+"""
+
+
+def _casefold(value):
+    """SQL casefold(): Unicode case folding (SQLite's lower() and LIKE only fold ASCII)"""
+    return value.casefold() if isinstance(value, str) else value
+
+
+def configure_connection(conn):
+    """Apply the per-connection settings shared by the app, MCP server and scripts
+
+    Read-heavy workload: memory-map the file and keep a large page cache.
+    synchronous=NORMAL makes commits cheaper and is safe under WAL.
+
+    journal_mode is not set here. WAL is persistent in the database file and
+    is switched on once, by init_db(), before it runs the migrations.
+
+    Also registers the casefold() SQL function used for case-insensitive
+    text search.
+
+    Returns:
+        The same connection, for chaining
+    """
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA mmap_size = 268435456')  # 256 MB
+    conn.execute('PRAGMA cache_size = -65536')  # 64 MB
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.create_function('casefold', 1, _casefold, deterministic=True)
+    return conn
@@ -3,9 +3,17 @@
 import pytest
 import tempfile
 import os
+import sys
 from app import create_app
 from app.database import get_db, init_db
 
+# The migration scripts import their helpers as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import migrate_to_multiuser  # noqa: E402
+
+TEST_USER_EMAIL = 'athlete@example.com'
+
 
 @pytest.fixture(scope='session')
 def app():
@@ -14,16 +22,25 @@ def app():
     db_fd, db_path = tempfile.mkstemp()
 
     # Create app with test configuration
-    app = create_app({
+    app = create_app(test_config={
         'TESTING': True,
         'DATABASE_PATH': db_path,
         'SECRET_KEY': 'test-secret-key',
         'WTF_CSRF_ENABLED': False
     })
 
-    # Initialize the database
+    # Initialize the database, then add the multi-user tables and columns
+    # that scripts/migrate_to_multiuser.py adds to real installs
     with app.app_context():
         init_db()
+        db = get_db()
+        migrate_to_multiuser.create_users_table(db)
+        migrate_to_multiuser.create_coach_athlete_table(db)
+        user_id = migrate_to_multiuser.create_admin_user(db, 'Test Athlete', TEST_USER_EMAIL, 'test-password')
+        migrate_to_multiuser.add_user_id_to_activities(db, user_id)
+        migrate_to_multiuser.add_user_id_to_days(db, user_id)
+        migrate_to_multiuser.add_user_id_to_extended_types(db, user_id)
+        db.commit()
 
     yield app
 
@@ -52,11 +69,19 @@ def db(app):
         db.execute('DELETE FROM extended_activity_types WHERE id > 100')  # Keep seed data
         db.execute('DELETE FROM days')
         db.execute('DELETE FROM gear')
+        db.execute('DELETE FROM api_keys')
+        db.execute('UPDATE users SET is_active = 1')
         db.commit()
 
         yield db
 
 
+@pytest.fixture(scope='function')
+def user_id(db):
+    """ID of the test athlete created with the multi-user tables"""
+    return db.execute('SELECT id FROM users WHERE email = ?', (TEST_USER_EMAIL,)).fetchone()[0]
+
+
 @pytest.fixture(scope='function')
 def runner(app):
     """Create a test CLI runner"""
@@ -0,0 +1,65 @@
+"""Tests for scripts/cleanup_sport_types.py"""
+
+import pytest
+
+import cleanup_sport_types
+
+from app.repositories.activity_repository import ActivityRepository
+from tests.fixtures import get_sample_activity
+
+
+@pytest.fixture
+def root_types(db):
+    """Add root='...' standard types; removes them and their renames afterwards"""
+    for name in ("root='Run'", "root='Kitesurfing'", "root=''"):
+        db.execute(
+            """INSERT INTO standard_activity_types (name, category, display_name, is_official, display_order)
+               VALUES (?, 'Other', ?, 0, 999)""",
+            (name, name)
+        )
+    db.commit()
+    yield
+    db.execute("DELETE FROM standard_activity_types WHERE name = 'Kitesurfing' OR name GLOB 'root=*'")
+    db.commit()
+
+
+def _stat_tables(db):
+    if not db.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        return None
+    return {row[0] for row in db.execute('SELECT DISTINCT tbl FROM sqlite_stat1')}
+
+
+def test_cleanup_remaps_and_renames_root_entries(db, user_id, root_types):
+    repo = ActivityRepository(db=db)
+    for activity_id, sport_type in ((1, "root='Run'"), (2, "root='Run'"), (3, 'Run'), (4, "root='Kitesurfing'")):
+        repo.create_activity({**get_sample_activity(activity_id, sport_type), 'user_id': user_id})
+    db.execute(
+        "INSERT INTO planned_activities (user_id, day_date, sport_type) VALUES (?, '2026-01-10', ?)",
+        (user_id, "root='Kitesurfing'")
+    )
+    db.commit()
+    stats_before = _stat_tables(db)
+
+    with db:
+        cleanup_sport_types.cleanup_sport_types(db)
+
+    # root='Run' is merged into the existing type; root='Kitesurfing' becomes its own type
+    types = dict(db.execute(
+        'SELECT name, is_official FROM standard_activity_types WHERE name IN (?, ?, ?, ?)',
+        ('Run', 'Kitesurfing', "root='Run'", "root='Kitesurfing'")
+    ).fetchall())
+    assert types == {'Run': 1, 'Kitesurfing': 0}
+    sport_types = dict(db.execute('SELECT id, sport_type FROM activities').fetchall())
+    assert sport_types == {1: 'Run', 2: 'Run', 3: 'Run', 4: 'Kitesurfing'}
+    assert db.execute('SELECT sport_type FROM planned_activities').fetchone()[0] == 'Kitesurfing'
+
+    # Unparseable entries are left alone, and no statistics or temp indexes stay behind
+    assert db.execute('SELECT 1 FROM standard_activity_types WHERE name = ?', ("root=''",)).fetchone()
+    assert _stat_tables(db) == stats_before
+    assert not db.execute("SELECT 1 FROM sqlite_master WHERE name LIKE 'tmp!_%' ESCAPE '!'").fetchone()
+
+
+def test_cleanup_without_root_entries_is_a_no_op(db, capsys):
+    cleanup_sport_types.cleanup_sport_types(db)
+
+    assert 'nothing to clean up' in capsys.readouterr().out
@@ -0,0 +1,158 @@
+"""Tests for the MCP server's API key auth cache, auth middleware and connection"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.repositories.api_key_repository import ApiKeyRepository
+from mcp_server import auth as mcp_auth
+from mcp_server import middleware as mcp_middleware
+from mcp_server.auth import cached_auth, get_current_auth, resolve_auth
+from mcp_server.db import open_db
+from mcp_server.middleware import ApiKeyMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Each test starts with an empty validation cache"""
+    mcp_auth._VALIDATION_CACHE.clear()
+    yield
+    mcp_auth._VALIDATION_CACHE.clear()
+
+
+@pytest.fixture
+def api_key(db, user_id):
+    """A freshly created readwrite key for the test athlete"""
+    return ApiKeyRepository(db=db).create_key(user_id, scope='readwrite', label='test')
+
+
+# -- auth cache ------------------------------------------------------------
+
+def test_resolve_auth_caches_valid_key(db, user_id, api_key):
+    auth = resolve_auth(db, api_key['raw_key'])
+
+    assert auth.user_id == user_id
+    assert auth.can_write
+    assert cached_auth(db, api_key['raw_key']) is auth
+
+
+def test_cached_auth_expires_after_ttl(db, api_key, monkeypatch):
+    monkeypatch.setattr(mcp_auth, '_VALIDATION_CACHE_TTL', 0.0)
+    resolve_auth(db, api_key['raw_key'])
+
+    assert cached_auth(db, api_key['raw_key']) is None
+    assert not mcp_auth._VALIDATION_CACHE
+
+
+def test_cached_auth_rejects_deleted_key(db, user_id, api_key):
+    resolve_auth(db, api_key['raw_key'])
+    ApiKeyRepository(db=db).delete_key(api_key['id'], user_id)
+
+    with pytest.raises(PermissionError, match='Invalid API key'):
+        cached_auth(db, api_key['raw_key'])
+    assert cached_auth(db, api_key['raw_key']) is None
+
+
+def test_cached_auth_rejects_deactivated_user(db, user_id, api_key):
+    resolve_auth(db, api_key['raw_key'])
+    db.execute('UPDATE users SET is_active = 0 WHERE id = ?', (user_id,))
+    db.commit()
+
+    with pytest.raises(PermissionError, match='not active'):
+        resolve_auth(db, api_key['raw_key'])
+
+
+def test_rejected_key_is_not_cached(db, user_id):
+    raw_key, key_hash, key_prefix = ApiKeyRepository.generate_key()
+
+    with pytest.raises(PermissionError):
+        resolve_auth(db, raw_key)
+    assert not mcp_auth._VALIDATION_CACHE
+
+    # The same key works as soon as it exists
+    db.execute(
+        'INSERT INTO api_keys (key_hash, key_prefix, user_id, scope) VALUES (?, ?, ?, ?)',
+        (key_hash, key_prefix, user_id, 'read')
+    )
+    db.commit()
+    assert resolve_auth(db, raw_key).user_id == user_id
+
+
+def test_malformed_key_is_rejected(db):
+    with pytest.raises(PermissionError, match='malformed'):
+        resolve_auth(db, 'not-a-key')
+
+
+# -- middleware --------------------------------------------------------------
+
+def _request(middleware, key=None, ip='10.0.0.1'):
+    """Send one HTTP request through the middleware and return the status"""
+    headers = [(b'authorization', f'Bearer {key}'.encode())] if key else []
+    scope = {'type': 'http', 'headers': headers, 'client': (ip, 50000)}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]['status']
+
+
+async def _app(scope, receive, send):
+    """Inner app: 200 if the middleware set an auth context"""
+    get_current_auth()
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def test_middleware_sets_and_resets_auth(db, api_key):
+    middleware = ApiKeyMiddleware(_app, db)
+
+    assert _request(middleware, api_key['raw_key']) == 200
+    with pytest.raises(PermissionError):
+        get_current_auth()
+
+
+def test_middleware_throttles_uncached_keys_after_failures(db, user_id, api_key):
+    middleware = ApiKeyMiddleware(_app, db)
+    assert _request(middleware, api_key['raw_key']) == 200  # now cached
+    other_key = ApiKeyRepository(db=db).create_key(user_id)['raw_key']
+
+    # Requests without a key are not failures
+    for _ in range(mcp_middleware._FAIL_LIMIT + 5):
+        assert _request(middleware) == 401
+    assert _request(middleware, 'am_bad') == 401
+
+    for _ in range(mcp_middleware._FAIL_LIMIT):
+        assert _request(middleware, 'am_bad') == 401
+    assert _request(middleware, 'am_bad') == 429
+
+    # Cached keys still pass; uncached keys wait, other IPs are unaffected
+    assert _request(middleware, api_key['raw_key']) == 200
+    assert _request(middleware, other_key) == 429
+    assert _request(middleware, other_key, ip='10.0.0.2') == 200
+
+
+# -- connection --------------------------------------------------------------
+
+def test_open_db_shares_one_connection_across_threads(app, monkeypatch):
+    monkeypatch.setenv('DATABASE_PATH', app.config['DATABASE_PATH'])
+    conn = open_db()
+    try:
+        assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+        # Tools run on the event loop thread, not the thread that opened it
+        result = []
+        worker = threading.Thread(
+            target=lambda: result.append(conn.execute("SELECT casefold('ÜBER')").fetchone()[0])
+        )
+        worker.start()
+        worker.join()
+        assert result == ['über']
+    finally:
+        conn.close()
@@ -0,0 +1,89 @@
+"""Tests for activity and gear repository queries"""
+
+import orjson
+
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.gear_repository import GearRepository
+from tests.fixtures import get_sample_activity
+
+
+def _add_activities(db, user_id, *activities):
+    repo = ActivityRepository(db=db)
+    for activity in activities:
+        repo.create_activity({**activity, 'user_id': user_id})
+
+
+def test_get_activities_json_matches_get_activities(db, user_id):
+    _add_activities(
+        db, user_id,
+        get_sample_activity(1, 'Run'),
+        get_sample_activity(2, 'Ride', start_date='2026-01-11T08:00:00', day_date='2026-01-11'),
+        get_sample_activity(3, 'Run', start_date='2026-01-12T08:00:00', day_date='2026-01-12'),
+    )
+    repo = ActivityRepository(db=db)
+
+    for kwargs in (
+        {},
+        {'filters': {'sport_type': 'Run'}},
+        {'filters': {'day_date': '2026-01-11'}},
+        {'limit': 1, 'offset': 1},
+    ):
+        expected = repo.get_activities(user_id=user_id, **kwargs)
+        assert orjson.loads(repo.get_activities_json(user_id=user_id, **kwargs)) == expected
+    assert [a['id'] for a in repo.get_activities(user_id=user_id)] == [3, 2, 1]
+
+
+def test_search_activities_matches_wildcards_literally(db, user_id):
+    _add_activities(
+        db, user_id,
+        get_sample_activity(1, name='100% effort'),
+        get_sample_activity(2, name='100 effort'),
+        get_sample_activity(3, name='hill_repeats'),
+        get_sample_activity(4, name='hillxrepeats'),
+        get_sample_activity(5, name='Warn!ng'),
+    )
+    repo = ActivityRepository(db=db)
+
+    def search(term):
+        return sorted(a['id'] for a in repo.search_activities(term, user_id=user_id))
+
+    assert search('100%') == [1]
+    assert search('hill_') == [3]
+    assert search('n!n') == [5]
+    assert search('EFFORT') == [1, 2]
+
+
+def test_search_activities_folds_unicode_case(db, user_id):
+    _add_activities(
+        db, user_id,
+        get_sample_activity(1, name='Über den Berg'),
+        get_sample_activity(2, name='Run', description='STRASSE und Straße'),
+    )
+    repo = ActivityRepository(db=db)
+
+    assert [a['id'] for a in repo.search_activities('über', user_id=user_id)] == [1]
+    assert [a['id'] for a in repo.search_activities('strasse und strasse', user_id=user_id)] == [2]
+
+
+def test_get_all_gear_with_stats_matches_per_gear_stats(db, user_id):
+    repo = GearRepository(db=db)
+    repo.create_or_update_gear('g1', {'name': 'Bike', 'gear_type': 'bike'})
+    repo.create_or_update_gear('g2', {'name': 'Shoes', 'gear_type': 'shoes'})
+    repo.create_or_update_gear('g3', {'name': 'Unused', 'gear_type': 'shoes'})
+    _add_activities(
+        db, user_id,
+        get_sample_activity(1, 'Ride', gear_id='g1', distance=40000.0),
+        get_sample_activity(2, 'Ride', gear_id='g1', distance=25500.0),
+        get_sample_activity(3, 'Run', gear_id='g2'),
+    )
+
+    all_gear = repo.get_all_gear_with_stats()
+
+    assert [g['name'] for g in all_gear] == ['Bike', 'Shoes', 'Unused']
+    for gear in all_gear:
+        assert gear['stats'] == repo.get_gear_stats(gear['id'])
+        assert gear['stats'] == repo.get_gear_with_stats(gear['id'])['stats']
+        assert 'total_activities' not in gear
+    assert all_gear[0]['stats']['total_activities'] == 2
+    assert all_gear[0]['stats']['total_distance_km'] == 65.5
+    assert all_gear[2]['stats']['total_activities'] == 0